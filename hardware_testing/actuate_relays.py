@@ -1,3 +1,4 @@
+import atexit
 import lgpio
 
 RELAY_PINS = {
@@ -19,11 +20,15 @@ except Exception as e:
         print(f"Error opening GPIO chip 0: {e2}")
         gpio_chip = None
 
-# Initialize all relay pins as outputs and set to HIGH (OFF)
+# Initialize all relay pins as one output group and set to HIGH (OFF)
 # Note: 0 = relay ON, 1 = relay OFF (inverted logic)
+# Claiming the pins as a group lets get_relay_states() fetch every level with a
+# single group_read (one GPIO_V2_LINE_GET_VALUES ioctl); gpio_read/gpio_write
+# still work on the individual group members.
+RELAY_GROUP = list(RELAY_PINS.values())  # First pin is the group leader
+_ALL_RELAYS_OFF = (1 << len(RELAY_GROUP)) - 1  # Group bits with every relay OFF (high)
 if gpio_chip is not None:
-    for physical_pin in RELAY_PINS.values():
-        lgpio.gpio_claim_output(gpio_chip, physical_pin, 1)  # 1 = OFF
+    lgpio.group_claim_output(gpio_chip, RELAY_GROUP, [1] * len(RELAY_GROUP))  # 1 = OFF
 
 def actuate_relay(relay_name, state):
     """
@@ -128,8 +133,25 @@ def actuate_all_relays(state):
     actuate_all_relays(True)   # Turn all relays ON
     actuate_all_relays(False)  # Turn all relays OFF
     """
-    for relay_name in RELAY_PINS.keys():
-        actuate_relay(relay_name, state)
+    if gpio_chip is None:
+        print("Error: GPIO chip not initialized")
+        return
+    
+    # Convert state to boolean
+    if isinstance(state, str):
+        state = state.lower() in ['on', 'true', '1']
+    else:
+        state = bool(state)
+    
+    try:
+        # One write for the whole group so all relays switch together.
+        # Inverted logic: 0 = ON, 1 = OFF, so ON clears every group bit
+        lgpio.group_write(gpio_chip, RELAY_GROUP[0], 0 if state else _ALL_RELAYS_OFF)
+    except Exception as e:
+        print(f"Error actuating relay group: {e}")
+        return
+    for relay_name, physical_pin in RELAY_PINS.items():
+        print(f"{relay_name} (Physical Pin {physical_pin}): {'ON' if state else 'OFF'}")
 
 def get_relay_states():
     """
@@ -143,16 +165,16 @@ def get_relay_states():
         print("Error: GPIO chip not initialized")
         return {}
     
-    states = {}
-    for relay_name, physical_pin in RELAY_PINS.items():
-        try:
-            # Inverted logic: GPIO reads 0 = relay ON (True), 1 = relay OFF (False)
-            gpio_value = lgpio.gpio_read(gpio_chip, physical_pin)
-            states[relay_name] = not bool(gpio_value)  # Invert: 0 -> True (ON), 1 -> False (OFF)
-        except Exception as e:
-            print(f"Error reading {relay_name}: {e}")
-            states[relay_name] = None
-    return states
+    try:
+        # One read for the whole group: bit i is the level of RELAY_GROUP[i]
+        _, levels = lgpio.group_read(gpio_chip, RELAY_GROUP[0])
+    except Exception as e:
+        print(f"Error reading relay group: {e}")
+        return {relay_name: None for relay_name in RELAY_PINS}
+    
+    # Inverted logic: GPIO reads 0 = relay ON (True), 1 = relay OFF (False)
+    return {relay_name: not (levels >> bit) & 1
+            for bit, relay_name in enumerate(RELAY_PINS)}
 
 def is_gpio_initialized():
     """
@@ -170,17 +192,20 @@ def cleanup_gpio():
     """
     global gpio_chip
     if gpio_chip is not None:
-        # Turn off all relays before cleanup (write 1 = OFF)
-        for physical_pin in RELAY_PINS.values():
-            try:
-                lgpio.gpio_write(gpio_chip, physical_pin, 1)  # 1 = OFF
-            except:
-                pass
+        # Turn off all relays before cleanup (write 1 = OFF) in one group write
+        try:
+            lgpio.group_write(gpio_chip, RELAY_GROUP[0], _ALL_RELAYS_OFF)
+        except:
+            pass
         
         lgpio.gpiochip_close(gpio_chip)
         gpio_chip = None
         print("GPIO cleanup completed")
 
+# Safety net: drive every relay OFF on interpreter exit, even if the caller
+# never reaches its own cleanup (cleanup_gpio is a no-op once already run)
+atexit.register(cleanup_gpio)
+
 if __name__ == "__main__":
     # Example usage
     print("Relay Control Example (Raspberry Pi 5 Compatible)")
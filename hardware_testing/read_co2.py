@@ -1,7 +1,9 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
-from collections import deque
+import queue
+import struct
+import threading
 import time
 from atlas_i2c import atlas_i2c, sensors, commands
 import serial
@@ -17,11 +19,14 @@ time.sleep(1)
 sensor_o2 = sensors.Sensor("O2", 108)
 sensor_o2.connect()
 
-# Data storage
+# Data storage: one preallocated row per sample (time, CO2, O2), used as a ring buffer
 max_points = 1000  # Number of data points to display
-co2_data = deque(maxlen=max_points)
-o2_data = deque(maxlen=max_points)
-time_data = deque(maxlen=max_points)
+samples = np.empty((max_points, 3))
+sample_head = 0  # Next row to write
+sample_count = 0
+# Readings from the polling thread waiting to be plotted, so the serial/I2C
+# waits never block the GUI
+sample_queue = queue.Queue(maxsize=128)
 
 # Setup the plot
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
@@ -37,7 +42,7 @@ co2_line, = ax1.plot([], [], 'b-', linewidth=2, label='CO2')
 # O2 subplot (bottom)
 ax2.set_title('O2 Concentration')
 ax2.set_ylabel('O2 (%)')
-ax2.set_xlabel('Time')
+ax2.set_xlabel('Time (seconds)')
 ax2.set_ylim(0, 41)  # Fixed scale as requested
 ax2.grid(True, alpha=0.3)
 o2_line, = ax2.plot([], [], 'r-', linewidth=2, label='O2')
@@ -49,62 +54,92 @@ ax2.legend()
 # Adjust layout
 plt.tight_layout()
 
-def animate(frame):
-    try:
-        # Read sensor data
-        # co2_reading = sensor_co2.query(commands.READ)
-        o2_reading = sensor_o2.query(commands.READ)
-        
-        # Parse the data (remove units and convert to float)
-        # co2_value = float(co2_reading.data.decode().replace('ppm', '').strip())
-        o2_value = float(o2_reading.data.decode().replace('%', '').strip())
-        
-        ser.write(b"\xFE\x44\x00\x08\x02\x9F\x25")
-        time.sleep(1)
-        resp=ser.read(7)
-        tmp = resp
-        high = tmp[3]
-        low = tmp[4]
-        co2_value = 10*((high*256)+low)
-        
-        # Add to data arrays
-        current_time = time.time()
-        co2_data.append(co2_value)
-        o2_data.append(o2_value)
-        time_data.append(current_time)
-        
-        # Update plots
-        if len(time_data) > 1:
-            # Convert time to relative seconds for better display
-            time_relative = [(t - time_data[0]) for t in time_data]
+# Table for the Modbus CRC-16 (reflected polynomial 0xA001, initial value 0xFFFF)
+CRC16_TABLE = []
+for byte in range(256):
+    crc = byte
+    for _ in range(8):
+        crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    CRC16_TABLE.append(crc)
+
+def modbus_crc(data):
+    """Modbus CRC-16 of data, as sent low byte first at the end of a Senseair frame."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ CRC16_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+def poll_sensors():
+    """Read both sensors about once a second and queue (time, CO2, O2) for the plot."""
+    while True:
+        try:
+            # Read sensor data
+            # co2_reading = sensor_co2.query(commands.READ)
+            o2_reading = sensor_o2.query(commands.READ)
+            
+            # Parse the data (remove units and convert to float)
+            # co2_value = float(co2_reading.data.decode().replace('ppm', '').strip())
+            o2_value = float(o2_reading.data.decode().replace('%', '').strip())
+            
+            # read() returns as soon as the 7-byte reply has arrived (the port's
+            # 1 s timeout only bounds a missing reply), so no fixed wait is needed
+            ser.flushInput()
+            ser.write(b"\xFE\x44\x00\x08\x02\x9F\x25")
+            resp=ser.read(7)
+            # Reply: FE 44 02 <CO2 hi> <CO2 lo> <CRC lo> <CRC hi>; drop short or corrupted frames
+            if len(resp) != 7 or modbus_crc(resp[:5]) != struct.unpack_from('<H', resp, 5)[0]:
+                print(f"Bad CO2 response: {resp.hex(' ').upper()}")
+                time.sleep(1)
+                continue
+            co2_value = 10 * struct.unpack_from('>H', resp, 3)[0]
             
-            ax1.clear()
-            ax1.set_title('CO2 Concentration')
-            ax1.set_ylabel('CO2 (ppm)')
-            ax1.set_ylim(300, 100000)
-            ax1.grid(True, alpha=0.3)
-            ax1.plot(time_relative, co2_data, 'b-', linewidth=2, label='CO2')
-            ax1.legend()
+            try:
+                sample_queue.put_nowait((time.monotonic(), co2_value, o2_value))
+            except queue.Full:
+                pass  # Plot has stalled; drop the sample rather than block the readings
             
-            ax2.clear()
-            ax2.set_title('O2 Concentration')
-            ax2.set_ylabel('O2 (%)')
-            ax2.set_xlabel('Time (seconds)')
-            ax2.set_ylim(0, 41)
-            ax2.grid(True, alpha=0.3)
-            ax2.plot(time_relative, o2_data, 'r-', linewidth=2, label='O2')
-            ax2.legend()
+            # Print current readings
+            print(f"CO2: {co2_value:.1f} ppm, O2: {o2_value:.1f}%")
+            time.sleep(1)
+        except Exception as e:
+            print(f"Error reading sensors: {e}")
+            time.sleep(1)
+
+def animate(frame):
+    global sample_head, sample_count
+    # Add any samples the polling thread has read since the last frame
+    got_samples = False
+    while True:
+        try:
+            samples[sample_head] = sample_queue.get_nowait()
+        except queue.Empty:
+            break
+        sample_head = (sample_head + 1) % max_points
+        sample_count = min(sample_count + 1, max_points)
+        got_samples = True
+    
+    # Update plots: swap the data of the existing lines instead of clearing
+    # and re-plotting the axes (titles, grid and legends are set up once above)
+    if got_samples and sample_count > 1:
+        # Oldest first; only copies once the buffer has wrapped
+        if sample_count < max_points:
+            history = samples[:sample_count]
+        else:
+            history = np.concatenate((samples[sample_head:], samples[:sample_head]))
+        # Convert time to relative seconds for better display
+        time_relative = history[:, 0] - history[0, 0]
         
-        # Print current readings
-        print(f"CO2: {co2_value:.1f} ppm, O2: {o2_value:.1f}%")
-        time.sleep(1)
-    except Exception as e:
-        print(f"Error reading sensors: {e}")
+        co2_line.set_data(time_relative, history[:, 1])
+        o2_line.set_data(time_relative, history[:, 2])
+        # Y ranges are fixed; only the time axis grows
+        for ax in (ax1, ax2):
+            ax.set_xlim(0, max(time_relative[-1], 1))
     
     return co2_line, o2_line
 
 # Start the animation
 print("Starting live monitoring... Press Ctrl+C to stop")
+threading.Thread(target=poll_sensors, daemon=True).start()
 ani = animation.FuncAnimation(fig, animate, interval=1000, blit=False)
 plt.show()
 
@@ -647,7 +647,7 @@ def plot_csv_data(csv_file_path: str = None, update_interval: float = 5.0, use_r
             
             # Show the figure window
             plt.show(block=False)
-            plt.pause(0.1)  # Give matplotlib time to display the window
+            fig.canvas.flush_events()  # Let the window map before the first draw
             
             # Store the number of groups and group names for change detection
             fig._last_num_groups = num_groups
@@ -935,8 +935,10 @@ def plot_csv_data(csv_file_path: str = None, update_interval: float = 5.0, use_r
                         ax.legend(fontsize=9)
         
         plt.tight_layout()
-        plt.draw()
-        plt.pause(0.1)  # Increased pause time to ensure display updates
+        # Schedule the redraw and let the GUI carry it out now; unlike plt.pause
+        # this doesn't spin the event loop for a fixed time
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
     
     def update_loop():
         """Continuously read data and signal main thread to update plot."""
@@ -987,9 +989,14 @@ def plot_csv_data(csv_file_path: str = None, update_interval: float = 5.0, use_r
                 except queue.Empty:
                     pass
             
-            # Process GUI events (must be on main thread)
-            plt.pause(0.1)
-            time.sleep(0.1)  # Small sleep to prevent busy loop
+            # Process GUI events (must be on main thread), then wait for new data
+            # or 0.1 s, whichever comes first, to keep the window responsive
+            if fig is not None:
+                if not plt.fignum_exists(fig.number):
+                    print("\nPlot window closed")
+                    break
+                fig.canvas.flush_events()
+            update_flag.wait(0.1)
     except KeyboardInterrupt:
         print("\nPlotting stopped by user")
     finally:
@@ -1,3 +1,4 @@
+import atexit
 import csv
 import json
 import logging
@@ -12,6 +13,7 @@ from typing import List, Tuple, Optional, Union, Any
 from datetime import datetime
 
 from . import components
+from .io import CAP_WRITER, COMPONENT_CAPS
 
 
 def _config_to_dict(config: Any) -> dict:
@@ -30,6 +32,21 @@ def _config_to_dict(config: Any) -> dict:
     return out
 
 
+def _make_csv_row_fn(csv_keys: Tuple[str, ...], csv_caps: Tuple[int, ...]):
+    """
+    Build a function that turns (timestamp, sensor_data, caps) into a CSV row list.
+    
+    The returned function reads the readings in csv_keys order. Columns without a
+    reading, or whose component (capability bit in csv_caps, 0 for none) is not
+    initialized in caps, are left empty.
+    """
+    columns = tuple(zip(csv_keys, csv_caps))
+    
+    def csv_row(timestamp, sd, caps):
+        return [timestamp] + [sd.get(key, '') if (caps & cap) == cap else '' for key, cap in columns]
+    return csv_row
+
+
 def _write_config_to_results(config: Any, data_dir: str) -> None:
     """Write the config object to run_config.json and run_config.py in data_dir."""
     data = _config_to_dict(config)
@@ -110,6 +127,7 @@ class Bioreactor():
 
         # Component initialization tracking
         self._initialized = {}
+        self._caps = 0  # Bitmask of io.CAP_* flags (see _update_caps)
         
         # Initialize components based on config
         if config and hasattr(config, 'INIT_COMPONENTS'):
@@ -122,6 +140,10 @@ class Bioreactor():
         # Threading
         self._threads = []
         self._stop_event = threading.Event()
+        # Timed pump runs (see io.schedule_pump_stop): per-pump count of commands so a
+        # stop only ends the run it was set for, and the lock pump commands hold
+        self._pump_run_tokens = {}
+        self._pump_lock = threading.RLock()
 
         # Set up CSV writer for sensor data
         # Automatically populate labels only for components that are enabled in INIT_COMPONENTS
@@ -137,12 +159,12 @@ class Bioreactor():
             
             # Auto-populate OD channel labels from OD_ADC_CHANNELS only if optical_density is enabled
             if od_enabled and hasattr(config, 'OD_ADC_CHANNELS'):
+                # Existing label keys, lowercased once, so any case of the channel name matches
+                labels_lc = {key.lower() for key in config.SENSOR_LABELS}
                 for ch_name in config.OD_ADC_CHANNELS.keys():
-                    # Check if label already exists (try various key formats)
+                    # Check if label already exists (in any case)
                     od_key = f"od_{ch_name.lower()}"
-                    if (od_key not in config.SENSOR_LABELS and 
-                        f"od_{ch_name}" not in config.SENSOR_LABELS and
-                        f"od_{ch_name.upper()}" not in config.SENSOR_LABELS):
+                    if od_key not in labels_lc:
                         # Auto-generate label: OD_<ChannelName>_V
                         config.SENSOR_LABELS[od_key] = f"OD_{ch_name}_V"
             
@@ -212,6 +234,7 @@ class Bioreactor():
             # Include both 'time' (timestamp) and 'elapsed_time' (elapsed seconds)
             # Only include sensor labels for components that are actually initialized
             sensor_keys = []
+            sensor_caps = []  # Capability bit of each column's component (0 if unknown)
             for key in config.SENSOR_LABELS.keys():
                 # Map sensor label keys to component names
                 component_name = None
@@ -233,13 +256,44 @@ class Bioreactor():
                 # Only include if component is initialized (or if we can't determine the component)
                 if component_name is None or init_components.get(component_name, False):
                     sensor_keys.append(key)
+                    sensor_caps.append(COMPONENT_CAPS.get(component_name, 0))
             
             fieldnames = ['time', 'elapsed_time'] + [config.SENSOR_LABELS[k] for k in sensor_keys]
         else:
             # Default fieldnames if no config provided
+            sensor_keys = []
+            sensor_caps = []
             fieldnames = ['time', 'elapsed_time']
         
         self.fieldnames = fieldnames
+        # Reading key (as stored in the sensor_data dicts) feeding each CSV column after
+        # 'time'. OD labels may be keyed with any case of the channel name, while
+        # readings always use od_<lowercase channel name>.
+        self._csv_keys = ('elapsed_time',) + tuple(
+            f"od_{key[3:].lower()}" if key.startswith('od_') else key for key in sensor_keys
+        )
+        # Enabled components that failed to initialize leave their columns empty
+        self._csv_caps = (0,) + tuple(sensor_caps)
+        # sensor_data keys, NaN fill and log templates for the OD channels and eyespy
+        # boards, worked out once for the per-tick measure/plot code in utils
+        if config and hasattr(config, 'OD_ADC_CHANNELS'):
+            od_channel_names = config.OD_ADC_CHANNELS.keys()
+        else:
+            # Fallback: use channel names from initialized od_channels
+            od_channel_names = getattr(self, 'od_channels', {}).keys()
+        self._od_plot_keys = {ch_name: f"od_{ch_name.lower()}" for ch_name in od_channel_names}
+        self._nan_od_template = dict.fromkeys(self._od_plot_keys.values(), float('nan'))
+        self._od_log_fmts = tuple(
+            (plot_key, f"OD {ch_name}: {{:.4f}}V") for ch_name, plot_key in self._od_plot_keys.items()
+        )
+        self._eyespy_keys = {
+            board_name: (f"eyespy_{board_name}_voltage", f"eyespy_{board_name}_raw")
+            for board_name in (getattr(self, 'eyespy_boards', None) or {})
+        }
+        self._eyespy_log_fmts = tuple(
+            (voltage_key, f"Eyespy {board_name}: {{:.4f}}V")
+            for board_name, (voltage_key, _) in self._eyespy_keys.items()
+        )
         
         # Get filename configuration
         # All data/results paths are relative to the directory containing bioreactor.py (src/)
@@ -291,6 +345,18 @@ class Bioreactor():
         self.out_file = open(out_file_path, 'w', newline='')
         self.writer = csv.DictWriter(self.out_file, fieldnames=fieldnames)
         self.writer.writeheader()
+        # Plain writer for the per-tick rows, which are built in column order
+        self._row_writer = csv.writer(self.out_file)
+        self._csv_row_fn = _make_csv_row_fn(self._csv_keys, self._csv_caps)
+        self._caps |= CAP_WRITER
+        # Data rows are buffered and written in batches (see write_row/flush_data)
+        self._csv_pending = []
+        self._csv_lock = threading.Lock()
+        self._csv_last_flush = time.monotonic()
+        self._csv_flush_rows = getattr(config, 'CSV_FLUSH_ROWS', 32) if config else 32
+        self._csv_flush_interval = getattr(config, 'CSV_FLUSH_INTERVAL', 5.0) if config else 5.0
+        # Make sure buffered rows reach the file even if finish() is never called
+        atexit.register(self.flush_data)
         self.logger.info(f"Data logging to: {out_file_path}")
 
         self.logger.info("Bioreactor initialization complete.")
@@ -327,6 +393,8 @@ class Bioreactor():
             except Exception as e:
                 self._initialized[component_name] = False
                 self.logger.error(f"{component_name} initialization exception: {e}")
+        
+        self._update_caps()
 
     # Utility methods for component initialization tracking
     
@@ -338,11 +406,20 @@ class Bioreactor():
             initialized (bool): Whether the component is initialized
         """
         self._initialized[component_name] = initialized
+        self._update_caps()
         if initialized:
             self.logger.info(f"{component_name} initialized.")
         else:
             self.logger.warning(f"{component_name} initialization failed.")
     
+    def _update_caps(self) -> None:
+        """Recompute the _caps bitmask from the initialized components (see io.CAP_*)."""
+        caps = self._caps & CAP_WRITER
+        for component_name, cap in COMPONENT_CAPS.items():
+            if self._initialized.get(component_name, False):
+                caps |= cap
+        self._caps = caps
+    
     def is_component_initialized(self, component_name: str) -> bool:
         """Check if a component is initialized.
         
@@ -374,12 +451,12 @@ class Bioreactor():
 
         self._threads = []
         def thread_worker(func, freq, dur):
-            start = time.time()
-            while not self._stop_event.is_set() and (dur is True or time.time() - start < dur):
-                t0 = time.time()
+            start = time.monotonic()
+            while not self._stop_event.is_set() and (dur is True or time.monotonic() - start < dur):
+                t0 = time.monotonic()
 
                 try:
-                    global_elapsed = time.time() - start
+                    global_elapsed = time.monotonic() - start
                     func(self, elapsed=global_elapsed)
                 except Exception as e:
                     self.logger.error(f"Exception in thread for {func.__name__}: {e}")
@@ -387,10 +464,11 @@ class Bioreactor():
                 if freq is True:
                     continue
 
-                loop_elapsed = time.time() - t0
+                loop_elapsed = time.monotonic() - t0
                 sleep_time = max(0, freq - loop_elapsed)
                 if sleep_time > 0:
-                    time.sleep(sleep_time)
+                    # Wait on the stop event so stop_all() wakes the job immediately
+                    self._stop_event.wait(sleep_time)
 
         for func, freq, dur in jobs:
             th = threading.Thread(target=thread_worker, args=(func, freq, dur))
@@ -405,6 +483,34 @@ class Bioreactor():
         self._stop_event.set()
         self.logger.info("Stop event set for all threads.")
 
+    def write_row(self, row) -> None:
+        """
+        Buffer one data row (values in fieldnames order) for the CSV file.
+        
+        Buffered rows are written and flushed together once CSV_FLUSH_ROWS rows are
+        pending or CSV_FLUSH_INTERVAL seconds have passed since the last write.
+        """
+        with self._csv_lock:
+            self._csv_pending.append(row)
+            if (len(self._csv_pending) < self._csv_flush_rows and
+                    time.monotonic() - self._csv_last_flush < self._csv_flush_interval):
+                return
+        self.flush_data()
+
+    def flush_data(self) -> None:
+        """Write any buffered data rows to the CSV file and flush it to disk."""
+        with self._csv_lock:
+            pending, self._csv_pending = self._csv_pending, []
+            self._csv_last_flush = time.monotonic()
+            if self.out_file.closed:
+                return
+            try:
+                if pending:
+                    self._row_writer.writerows(pending)
+                self.out_file.flush()
+            except Exception as e:
+                self.logger.error(f"Error writing to CSV: {e}")
+
     def finish(self) -> None:
         """Clean up bioreactor resources."""
         self.logger.info("Cleaning up Bioreactor...")
@@ -412,9 +518,17 @@ class Bioreactor():
         # Stop all threads
         self.stop_all()
 
-        # Close CSV file
+        # Stop the live plot (thread, if any) and close its window, if plotting was used
+        try:
+            from .utils import stop_live_plot
+            stop_live_plot()
+        except Exception as e:
+            self.logger.error(f"Failed to stop live plot: {e}")
+
+        # Close CSV file (writing out any buffered rows first)
         if hasattr(self, 'out_file') and self.out_file:
             try:
+                self.flush_data()
                 self.out_file.close()
                 self.logger.info("Data file closed.")
             except Exception as e:
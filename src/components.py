@@ -200,6 +200,9 @@ def init_temp_sensor(bioreactor, config):
             sensors = np.array(all_sensors)
         
         bioreactor.temp_sensors = sensors
+        # Bound read methods, resolved once so io.get_temperature can skip the
+        # attribute and array lookups on every read
+        bioreactor._temp_readers = tuple(sensor.get_temperature for sensor in sensors)
         logger.info(f"DS18B20 temperature sensors initialized ({len(sensors)} sensors)")
         
         return {'sensors': sensors, 'initialized': True}
@@ -645,6 +648,27 @@ def init_o2_sensor(bioreactor, config):
         return {'initialized': False, 'error': str(e)}
 
 
+def _converse_pump_name(pump_name: str):
+    """
+    Return the name of the pump paired with pump_name for balanced flow, or None.
+    
+    'inflow' pairs with 'outflow' (and vice versa); otherwise <base>_in/_inflow
+    pairs with <base>_out and <base>_out/_outflow with <base>_in.
+    """
+    if pump_name == 'inflow':
+        return 'outflow'
+    if pump_name == 'outflow':
+        return 'inflow'
+    if pump_name.endswith('_in') or pump_name.endswith('_inflow'):
+        # Remove suffix and add outflow suffix
+        base = pump_name.rsplit('_', 1)[0]
+        return f"{base}_out" if not base.endswith('out') else f"{base}_outflow"
+    if pump_name.endswith('_out') or pump_name.endswith('_outflow'):
+        base = pump_name.rsplit('_', 1)[0]
+        return f"{base}_in" if not base.endswith('in') else f"{base}_inflow"
+    return None
+
+
 def init_pumps(bioreactor, config):
     """
     Initialize pump controllers using ticUSB protocol.
@@ -731,6 +755,8 @@ def init_pumps(bioreactor, config):
         bioreactor.pumps = pumps
         bioreactor.pump_configs = pump_configs
         bioreactor.pump_direction = pump_direction
+        # Balanced-flow partner of each pump (None if it can't be inferred from the name)
+        bioreactor._converse_pump = {name: _converse_pump_name(name) for name in pumps}
         
         logger.info(f"Pumps initialized: {len(pumps)} pump(s) - {list(pumps.keys())}")
         
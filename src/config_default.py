@@ -17,6 +17,10 @@ class Config:
     CLEAR_LOG_ON_START: bool = True  # If True, clears/truncates the log file on startup
     DATA_OUT_FILE: str = 'bioreactor_data.csv'
     USE_TIMESTAMPED_FILENAME: bool = True  # If True, adds timestamp prefix (e.g., "20250113_153000_bioreactor_data.csv"). If False, uses base filename only.
+    CSV_FLUSH_ROWS: int = 32  # Data rows are buffered and written out once this many are pending...
+    CSV_FLUSH_INTERVAL: float = 5.0  # ...or this many seconds after the last write, whichever comes first
+    DEDUP_MIN_DELTA: Optional[float] = None  # measure_and_plot_sensors skips recording/plotting a sample when temperature and all OD readings moved less than this since the last kept one (None = keep every sample)
+    AGG_SAMPLES: Optional[int] = None  # measure_and_plot_sensors records/plots one sample per this many calls, averaging temperature and OD readings over them (None = record every call)
     
     # Results package: put each run in a dated directory with output + copy of script
     RESULTS_PACKAGE: bool = True  # If True, create a dated dir and write output + script copy there
@@ -5,11 +5,52 @@ These are not intended to be used directly by the user, but rather to be used by
 
 import logging
 import math
+import threading
 import time
 from typing import Optional, Dict, Union
 
+# lgpio is only available on the Pi; the GPIO drivers below report its absence
+# when used. Imported once here since the peltier driver is set on every PID tick.
+try:
+    import lgpio
+except Exception:
+    lgpio = None
+
+# Capability bits for the components the per-tick jobs check. Bioreactor keeps the
+# OR of the initialized ones in _caps so a guard is a single integer AND.
+CAP_PUMPS = 1
+CAP_LED = 2
+CAP_OD = 4
+CAP_PELTIER = 8
+CAP_WRITER = 16  # CSV data writer is set up
+CAP_TEMP = 32
+CAP_EYESPY = 64
+CAP_CO2 = 128
+CAP_O2 = 256
+CAP_RING_LIGHT = 512
+
+# Component name -> capability bit
+COMPONENT_CAPS = {
+    'pumps': CAP_PUMPS,
+    'led': CAP_LED,
+    'optical_density': CAP_OD,
+    'peltier_driver': CAP_PELTIER,
+    'temp_sensor': CAP_TEMP,
+    'eyespy_adc': CAP_EYESPY,
+    'co2_sensor': CAP_CO2,
+    'o2_sensor': CAP_O2,
+    'ring_light': CAP_RING_LIGHT,
+}
+
 logger = logging.getLogger("Bioreactor.IO")
 
+_NAN = float('nan')
+
+# Direction words accepted by set_peltier_power; forward drives the module cooling.
+_COOL_STRS = frozenset({'forward', 'cool', 'cold'})
+_HEAT_STRS = frozenset({'reverse', 'heat', 'warm', 'hot'})
+_TRUE_STRS = frozenset({'true', '1', 'on'})
+
 
 class PeltierDriver:
     """PWM/DIR controller for the peltier module using lgpio."""
@@ -31,10 +72,8 @@ class PeltierDriver:
             duty_cycle: Target duty cycle (0-100)
             forward: Direction flag (True=forward/heat, False=reverse/cool)
         """
-        try:
-            import lgpio
-        except Exception as e:
-            self.bioreactor.logger.error(f"Peltier driver requires lgpio: {e}")
+        if lgpio is None:
+            self.bioreactor.logger.error("Peltier driver requires lgpio")
             return False
 
         try:
@@ -59,7 +98,6 @@ class PeltierDriver:
     def stop(self) -> None:
         """Stop PWM output."""
         try:
-            import lgpio
             lgpio.tx_pwm(self._gpio_chip, self._pwm_pin, self._frequency, 0)
             self._last_duty = 0.0
             self.bioreactor.logger.info("Peltier PWM stopped.")
@@ -87,10 +125,8 @@ class StirrerDriver:
 
     def set_speed(self, duty_cycle: float) -> bool:
         """Set stirrer PWM duty cycle (0-100)."""
-        try:
-            import lgpio
-        except Exception as e:
-            self.bioreactor.logger.error(f"Stirrer driver requires lgpio: {e}")
+        if lgpio is None:
+            self.bioreactor.logger.error("Stirrer driver requires lgpio")
             return False
 
         try:
@@ -110,7 +146,6 @@ class StirrerDriver:
     def stop(self) -> None:
         """Stop stirrer (0% duty)."""
         try:
-            import lgpio
             lgpio.tx_pwm(self._gpio_chip, self._pwm_pin, self._frequency, 0)
             self._duty = 0.0
             self.bioreactor.logger.info("Stirrer stopped (0% duty).")
@@ -134,10 +169,8 @@ class LEDDriver:
 
     def set_power(self, power: float) -> bool:
         """Set LED PWM power (0-100)."""
-        try:
-            import lgpio
-        except Exception as e:
-            self.bioreactor.logger.error(f"LED driver requires lgpio: {e}")
+        if lgpio is None:
+            self.bioreactor.logger.error("LED driver requires lgpio")
             return False
 
         try:
@@ -157,7 +190,6 @@ class LEDDriver:
     def off(self) -> None:
         """Turn LED off (0% power)."""
         try:
-            import lgpio
             lgpio.tx_pwm(self._gpio_chip, self._pwm_pin, self._frequency, 0)
             self._power = 0.0
             self.bioreactor.logger.info("LED turned off (0% power).")
@@ -365,7 +397,8 @@ def turn_off_ring_light(bioreactor) -> None:
         bioreactor.logger.error(f"Error turning off ring light: {e}")
 
 
-def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_name: str = 'Trx') -> Optional[Union[float, Dict[str, float]]]:
+def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_name: str = 'Trx',
+               raw_out: Optional[Dict[str, int]] = None) -> Optional[Union[float, Dict[str, float]]]:
     """
     Measure optical density by turning LED on, taking readings, and averaging.
     Also reads eyespy ADC boards if initialized.
@@ -384,6 +417,8 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
         led_power: LED power level (0-100)
         averaging_duration: Duration in seconds to average readings
         channel_name: Name of the ADC channel to read, or 'all' to measure all channels (default: 'Trx')
+        raw_out: Optional dict filled with the last raw ADC reading of each eyespy board
+                 taken during the measurement window (default: None)
         
     Returns:
         float: Averaged voltage reading for single channel, or None if error
@@ -392,12 +427,15 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
     """
     import time
     
-    if not bioreactor.is_component_initialized('led'):
+    # Component flags are read from the cached bitmask once for the whole call
+    caps = bioreactor._caps
+    if not caps & CAP_LED:
         bioreactor.logger.error("LED driver not initialized")
         return None
     
-    od_initialized = bioreactor.is_component_initialized('optical_density')
-    eyespy_initialized = bioreactor.is_component_initialized('eyespy_adc')
+    od_initialized = caps & CAP_OD
+    eyespy_initialized = caps & CAP_EYESPY
+    ring_light_available = bool(caps & CAP_RING_LIGHT) and hasattr(bioreactor, 'ring_light_driver')
     
     if not od_initialized and not eyespy_initialized:
         bioreactor.logger.error("Neither optical density sensor nor eyespy ADC initialized")
@@ -429,7 +467,7 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
     # Store ring light state and turn it off (dodging) before OD measurement
     ring_light_was_on = False
     ring_light_previous_color = (0, 0, 0)
-    if bioreactor.is_component_initialized('ring_light') and hasattr(bioreactor, 'ring_light_driver'):
+    if ring_light_available:
         ring_light_was_on = bioreactor.ring_light_driver.is_on
         ring_light_previous_color = bioreactor.ring_light_driver.current_color
         bioreactor.ring_light_driver.off()
@@ -448,21 +486,50 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
         # Use dictionary to store readings for each channel/board
         all_readings = {ch: [] for ch in channels_to_measure}
         eyespy_readings = {board: [] for board in eyespy_boards}
-        start_time = time.time()
+        
+        # Resolve the ADC channel objects and eyespy board settings once, so the
+        # sampling loop below only does the actual reads
+        od_channels = getattr(bioreactor, 'od_channels', {})
+        od_sources = []
+        for ch in channels_to_measure:
+            if ch in od_channels:
+                od_sources.append((all_readings[ch], od_channels[ch], ch))
+            else:
+                bioreactor.logger.warning(f"OD channel '{ch}' not found. Available: {list(od_channels.keys())}")
+        eyespy_read_func = getattr(bioreactor, '_eyespy_read_func', None)
+        eyespy_sources = []
+        if eyespy_boards and not eyespy_read_func:
+            bioreactor.logger.error("Eyespy read function not available")
+        elif eyespy_boards:
+            for board_name in eyespy_boards:
+                board_cfg = bioreactor.eyespy_boards[board_name]
+                eyespy_sources.append((
+                    eyespy_readings[board_name], board_name, board_cfg['i2c_address'], board_cfg['i2c_bus'],
+                    board_cfg['gain'], _eyespy_volts_per_count(board_cfg),
+                ))
+        
+        start_time = time.monotonic()
         sample_interval = 0.01  # Sample every 10ms for smooth averaging
         
-        while (time.time() - start_time) < averaging_duration:
+        while (time.monotonic() - start_time) < averaging_duration:
             # Read OD channels
-            for ch in channels_to_measure:
-                voltage = read_voltage(bioreactor, ch)
-                if voltage is not None:
-                    all_readings[ch].append(voltage)
+            for readings, channel, ch in od_sources:
+                try:
+                    readings.append(channel.voltage)
+                except Exception as e:
+                    bioreactor.logger.error(f"Error reading voltage from channel {ch}: {e}")
             
             # Read eyespy boards
-            for board_name in eyespy_boards:
-                voltage = read_eyespy_voltage(bioreactor, board_name)
-                if voltage is not None:
-                    eyespy_readings[board_name].append(voltage)
+            for readings, board_name, i2c_address, i2c_bus, gain, volts_per_count in eyespy_sources:
+                try:
+                    raw_value = eyespy_read_func(i2c_address=i2c_address, i2c_bus=i2c_bus, gain=gain)
+                except Exception as e:
+                    bioreactor.logger.error(f"Error reading eyespy ADC board {board_name}: {e}")
+                    continue
+                if raw_value is not None:
+                    readings.append(raw_value * volts_per_count)
+                    if raw_out is not None:
+                        raw_out[board_name] = raw_value
             
             time.sleep(sample_interval)
         
@@ -470,7 +537,7 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
         bioreactor.led_driver.off()
         
         # Restore ring light to previous state (after IR LED is off)
-        if bioreactor.is_component_initialized('ring_light') and hasattr(bioreactor, 'ring_light_driver'):
+        if ring_light_available:
             if ring_light_was_on:
                 bioreactor.ring_light_driver.set_color(ring_light_previous_color)
                 bioreactor.logger.info(f"Ring light restored to previous state: color={ring_light_previous_color}")
@@ -531,7 +598,7 @@ def measure_od(bioreactor, led_power: float, averaging_duration: float, channel_
         except:
             pass
         # Restore ring light to previous state even on error
-        if bioreactor.is_component_initialized('ring_light') and hasattr(bioreactor, 'ring_light_driver'):
+        if ring_light_available:
             try:
                 if ring_light_was_on:
                     bioreactor.ring_light_driver.set_color(ring_light_previous_color)
@@ -553,29 +620,30 @@ def get_temperature(bioreactor, sensor_index=0):
         float: Temperature in Celsius, or NaN if sensor not available
     """
     if not bioreactor.is_component_initialized('temp_sensor'):
-        return float('nan')
+        return _NAN
+    
+    readers = getattr(bioreactor, '_temp_readers', ())
+    if sensor_index >= len(readers):
+        bioreactor.logger.warning(f"Temperature sensor index {sensor_index} not available")
+        return _NAN
     
     try:
-        if hasattr(bioreactor, 'temp_sensors') and len(bioreactor.temp_sensors) > sensor_index:
-            bioreactor.logger.info(f"Reading temperature from sensor {sensor_index}")
-            temperature = bioreactor.temp_sensors[sensor_index].get_temperature()
-            
-            # Check if temperature is within valid bounds (0-100°C)
-            if not math.isnan(temperature):
-                if temperature < 0.0 or temperature > 100.0:
-                    bioreactor.logger.warning(
-                        f"Temperature reading {temperature:.2f}°C is outside valid bounds (0-100°C), returning NaN"
-                    )
-                    return float('nan')
-            
-            bioreactor.logger.info(f"Temperature: {temperature}")
-            return temperature
-        else:
-            bioreactor.logger.warning(f"Temperature sensor index {sensor_index} not available")
-            return float('nan')
+        bioreactor.logger.info(f"Reading temperature from sensor {sensor_index}")
+        temperature = readers[sensor_index]()
+        
+        # Check if temperature is within valid bounds (0-100°C)
+        if not math.isnan(temperature):
+            if temperature < 0.0 or temperature > 100.0:
+                bioreactor.logger.warning(
+                    f"Temperature reading {temperature:.2f}°C is outside valid bounds (0-100°C), returning NaN"
+                )
+                return _NAN
+        
+        bioreactor.logger.info(f"Temperature: {temperature}")
+        return temperature
     except Exception as e:
         bioreactor.logger.error(f"Error reading temperature sensor {sensor_index}: {e}")
-        return float('nan')
+        return _NAN
 
 
 def set_peltier_power(bioreactor, duty_cycle: Union[int, float], forward: Union[bool, str] = True) -> bool:
@@ -597,13 +665,13 @@ def set_peltier_power(bioreactor, duty_cycle: Union[int, float], forward: Union[
 
     if isinstance(forward, str):
         fwd = forward.lower()
-        if fwd in ('forward', 'cool', 'cold'):
+        if fwd in _COOL_STRS:
             forward_bool = True
-        elif fwd in ('reverse', 'heat', 'warm', 'hot'):
+        elif fwd in _HEAT_STRS:
             forward_bool = False
         else:
             # Fallback: interpret truthy string as True
-            forward_bool = fwd in ('true', '1', 'on')
+            forward_bool = fwd in _TRUE_STRS
     else:
         forward_bool = bool(forward)
 
@@ -748,6 +816,28 @@ def read_eyespy_adc(bioreactor, board_name: str = None) -> Optional[int]:
         return None
 
 
+# Full-scale ranges for the ADS1114 gain settings (from the datasheet)
+_EYESPY_FSR_MAP = {
+    2/3: 6.144,
+    1.0: 4.096,
+    2.0: 2.048,
+    4.0: 1.024,
+    8.0: 0.512,
+    16.0: 0.256,
+}
+
+
+def _eyespy_volts_per_count(board_cfg: dict) -> float:
+    """Return volts per raw eyespy ADC count for the board's gain setting (FSR / 32767)."""
+    fsr = _EYESPY_FSR_MAP.get(board_cfg['gain'], 4.096)  # Default to 4.096 if gain not found
+    return fsr / 32767.0
+
+
+def _eyespy_raw_to_voltage(board_cfg: dict, raw_value: int) -> float:
+    """Convert a raw eyespy ADC reading to volts using the board's gain setting."""
+    return raw_value * _eyespy_volts_per_count(board_cfg)
+
+
 def read_eyespy_voltage(bioreactor, board_name: str = None) -> Optional[float]:
     """
     Read voltage from an eyespy board (ADS1114), converting raw ADC value to voltage.
@@ -785,25 +875,7 @@ def read_eyespy_voltage(bioreactor, board_name: str = None) -> Optional[float]:
     if board_name not in bioreactor.eyespy_boards:
         return None
     
-    board_cfg = bioreactor.eyespy_boards[board_name]
-    gain = board_cfg['gain']
-    
-    # Full-scale ranges for different gains (from ADS1114 datasheet)
-    fsr_map = {
-        2/3: 6.144,
-        1.0: 4.096,
-        2.0: 2.048,
-        4.0: 1.024,
-        8.0: 0.512,
-        16.0: 0.256,
-    }
-    
-    fsr = fsr_map.get(gain, 4.096)  # Default to 4.096 if gain not found
-    
-    # Convert raw value to voltage: voltage = (raw_value / 32767) * FSR
-    voltage = (raw_value / 32767.0) * fsr
-    
-    return voltage
+    return _eyespy_raw_to_voltage(bioreactor.eyespy_boards[board_name], raw_value)
 
 
 def read_all_eyespy_boards(bioreactor) -> Optional[Dict[str, int]]:
@@ -1067,26 +1139,13 @@ def read_co2(bioreactor) -> Optional[int]:
         return None
 
 
-def change_pump(bioreactor, pump_name: str, ml_per_sec: float, direction: Optional[str] = None) -> None:
+def _pump_velocity(bioreactor, pump_name: str, ml_per_sec: float, direction: Optional[str] = None) -> int:
     """
-    Change pump flow rate in ml/sec.
+    Validate a pump request and convert ml/sec to a signed Tic target velocity.
     
-    Follows the bioreactor_v2 change_pump pattern but without calibration.
-    Uses a simple linear conversion from ml/sec to steps/sec.
-    
-    Args:
-        bioreactor: Bioreactor instance
-        pump_name: Name of the pump (e.g., 'inflow', 'outflow')
-        ml_per_sec: Desired flow rate in ml/sec (>= 0)
-        direction: Optional direction override ('forward' or 'reverse'). 
-                  If None, uses direction from pump config.
-        
     Raises:
         ValueError: If pump not found, ml_per_sec is negative, or other validation errors
     """
-    if not bioreactor.is_component_initialized('pumps'):
-        return
-    
     if not hasattr(bioreactor, 'pumps') or pump_name not in bioreactor.pumps:
         raise ValueError(f"No pump named '{pump_name}' configured")
     
@@ -1115,25 +1174,85 @@ def change_pump(bioreactor, pump_name: str, ml_per_sec: float, direction: Option
     steps_per_sec = 8 * int(ml_per_sec * steps_per_ml / 8)  # Match bioreactor_v2 pattern: 8*int(...)
     
     # Set velocity sign: positive if direction is 'forward', negative if 'reverse'
-    velocity = steps_per_sec if pump_direction == 'forward' else -steps_per_sec
+    return steps_per_sec if pump_direction == 'forward' else -steps_per_sec
+
+
+def change_pump(bioreactor, pump_name: str, ml_per_sec: float, direction: Optional[str] = None) -> None:
+    """
+    Change pump flow rate in ml/sec.
     
-    try:
-        pump = bioreactor.pumps[pump_name]
-        if velocity == 0:
-            pump.deenergize()
-            bioreactor.logger.info(f"Set pump {pump_name} to de-energized (0 ml/sec).")
-        else:
-            pump.energize()
-            pump.exit_safe_start()
-            time.sleep(0.01)  # Small delay after exit_safe_start (matching bioreactor_v2)
-            pump.set_target_velocity(velocity)
-            bioreactor.logger.info(
-                f"Set pump {pump_name} to {ml_per_sec:.4f} ml/sec "
-                f"(velocity {velocity}, direction {pump_direction})."
-            )
-    except Exception as e:
-        bioreactor.logger.error(f"Error setting velocity for '{pump_name}': {e}")
-        raise
+    Follows the bioreactor_v2 change_pump pattern but without calibration.
+    Uses a simple linear conversion from ml/sec to steps/sec.
+    
+    Args:
+        bioreactor: Bioreactor instance
+        pump_name: Name of the pump (e.g., 'inflow', 'outflow')
+        ml_per_sec: Desired flow rate in ml/sec (>= 0)
+        direction: Optional direction override ('forward' or 'reverse'). 
+                  If None, uses direction from pump config.
+        
+    Raises:
+        ValueError: If pump not found, ml_per_sec is negative, or other validation errors
+    """
+    change_pumps(bioreactor, {pump_name: ml_per_sec}, direction=direction)
+
+
+def change_pumps(bioreactor, updates: Dict[str, float], direction: Optional[str] = None) -> None:
+    """
+    Change the flow rate of several pumps together.
+    
+    All requests are validated before any pump is touched. Pumps being started are
+    energized first and share a single settle delay, then all target velocities are
+    written back-to-back so the pumps change rate at (nearly) the same moment.
+    
+    Args:
+        bioreactor: Bioreactor instance
+        updates: Mapping of pump name to desired flow rate in ml/sec (>= 0)
+        direction: Optional direction override ('forward' or 'reverse') applied to all pumps.
+                  If None, each pump uses its direction from pump config.
+        
+    Raises:
+        ValueError: If a pump is not found, a rate is negative, or other validation errors
+    """
+    if not bioreactor.is_component_initialized('pumps'):
+        return
+    
+    velocities = {
+        pump_name: _pump_velocity(bioreactor, pump_name, ml_per_sec, direction)
+        for pump_name, ml_per_sec in updates.items()
+    }
+    
+    pump_name = None
+    # Serialized with the timed-stop checks so a queued stop can't interleave with a restart
+    with bioreactor._pump_lock:
+        # Any new command supersedes the timed stops queued for these pumps
+        tokens = bioreactor._pump_run_tokens
+        for pump_name in velocities:
+            tokens[pump_name] = tokens.get(pump_name, 0) + 1
+        try:
+            # Energize the pumps being started, with one shared delay after exit_safe_start
+            starting = [pump_name for pump_name, velocity in velocities.items() if velocity != 0]
+            for pump_name in starting:
+                pump = bioreactor.pumps[pump_name]
+                pump.energize()
+                pump.exit_safe_start()
+            if starting:
+                time.sleep(0.01)  # Small delay after exit_safe_start (matching bioreactor_v2)
+            
+            for pump_name, velocity in velocities.items():
+                pump = bioreactor.pumps[pump_name]
+                if velocity == 0:
+                    pump.deenergize()
+                    bioreactor.logger.info(f"Set pump {pump_name} to de-energized (0 ml/sec).")
+                else:
+                    pump.set_target_velocity(velocity)
+                    bioreactor.logger.info(
+                        f"Set pump {pump_name} to {updates[pump_name]:.4f} ml/sec "
+                        f"(velocity {velocity}, direction {'forward' if velocity > 0 else 'reverse'})."
+                    )
+        except Exception as e:
+            bioreactor.logger.error(f"Error setting velocity for '{pump_name}': {e}")
+            raise
 
 
 def stop_pump(bioreactor, pump_name: str) -> None:
@@ -1154,14 +1273,52 @@ def stop_all_pumps(bioreactor) -> None:
     Args:
         bioreactor: Bioreactor instance
     """
+    # init_pumps only reports success after storing bioreactor.pumps
     if not bioreactor.is_component_initialized('pumps'):
         return
     
-    if not hasattr(bioreactor, 'pumps'):
-        return
-    
     for pump_name in bioreactor.pumps.keys():
         try:
             change_pump(bioreactor, pump_name, 0.0)
         except Exception as e:
             bioreactor.logger.error(f"Error stopping pump {pump_name}: {e}")
+
+
+def schedule_pump_stop(bioreactor, pump_name: str, delay: float) -> None:
+    """
+    Stop a pump after a delay without blocking the caller.
+    
+    The stop applies only to the pump's current run: if the pump is commanded again
+    (e.g. restarted by the next job tick) before the delay is up, the stop is dropped.
+    The stop is carried out by a timer thread, so it lands on time whether or not
+    Bioreactor.run() is going.
+    
+    Args:
+        bioreactor: Bioreactor instance
+        pump_name: Name of the pump to stop
+        delay: Seconds from now after which the pump is stopped
+    """
+    with bioreactor._pump_lock:
+        token = bioreactor._pump_run_tokens.get(pump_name, 0)
+    _start_pump_stop_timer(bioreactor, pump_name, token, delay)
+
+
+def _start_pump_stop_timer(bioreactor, pump_name: str, token: int, delay: float) -> None:
+    """Stop a pump's run (identified by token) from a daemon timer thread after delay seconds."""
+    timer = threading.Timer(delay, _stop_pump_runs, args=(bioreactor, [(pump_name, token)]))
+    timer.daemon = True
+    timer.start()
+
+
+def _stop_pump_runs(bioreactor, runs) -> None:
+    """Stop each (pump name, run token) pair whose pump has not been commanded since."""
+    with bioreactor._pump_lock:
+        tokens = bioreactor._pump_run_tokens
+        due = [pump_name for pump_name, token in runs if tokens.get(pump_name, 0) == token]
+        if not due:
+            return
+        try:
+            change_pumps(bioreactor, dict.fromkeys(due, 0.0))
+            bioreactor.logger.info(f"Pumps {', '.join(due)} stopped at end of timed run")
+        except Exception as e:
+            bioreactor.logger.error(f"Error stopping pumps {', '.join(due)}: {e}")
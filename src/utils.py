@@ -4,30 +4,443 @@ These functions combine multiple operations or provide higher-level convenience
 These functions are designed to be used with bioreactor.run() for scheduled tasks.
 """
 
+import math
 import time
 import logging
-from typing import Union, Optional
-from collections import deque
+import queue
+import threading
+from typing import Optional
 from datetime import datetime
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
+from .io import (
+    get_temperature, read_voltage, measure_od, read_all_eyespy_boards, read_eyespy_voltage,
+    read_co2, read_o2, get_peltier_state, get_ring_light_color,
+    set_peltier_power, stop_peltier, set_ring_light, turn_off_ring_light, change_pump,
+    change_pumps, schedule_pump_stop,
+    CAP_PUMPS, CAP_LED, CAP_OD, CAP_PELTIER, CAP_WRITER, CAP_TEMP, CAP_EYESPY, CAP_CO2, CAP_O2,
+    CAP_RING_LIGHT,
+)
+
 logger = logging.getLogger("Bioreactor.Utils")
 
+PLOT_DATA_MAXLEN = 1000
+PLOT_MIN_INTERVAL = 0.25  # Minimum seconds between live plot redraws
+PLOT_MAX_POINTS = 250  # Lines are decimated to about this many points per redraw
+PLOT_ERROR_BACKOFF = 1.0  # Seconds the plot thread waits after an error
+_NAN = float('nan')
+
+# Log line templates; only the numeric values are formatted per call
+_TEMP_LOG_FMT = "Temp: {:.2f}°C"
+_CO2_LOG_FMT = "CO2: {:.0f} ppm"
+_O2_LOG_FMT = "O2: {:.2f}%"
+_PELTIER_LOG_FMT = "Peltier: {:.1f}% {}"
+_RING_LOG_FMT = "Ring: ({:d},{:d},{:d})"
+
+
+class _RingBuffer:
+    """
+    Fixed-size sample history backed by a preallocated, NaN-filled numpy array.
+    
+    Readings are stored as float32 by default, which is plenty for plotting and
+    a fraction of the memory of boxed floats in a deque; timestamps should use
+    float64 so long runs keep sub-second resolution.
+    """
+    __slots__ = ('buf', 'scratch', 'capacity', 'head', 'count', 'total')
+    
+    def __init__(self, capacity: int = PLOT_DATA_MAXLEN, dtype=np.float32):
+        self.buf = np.full(capacity, np.nan, dtype=dtype)
+        self.scratch = np.empty_like(self.buf)  # Unwrapped copy handed out by view()
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        self.total = 0  # Samples ever appended, including overwritten ones
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, value: float) -> None:
+        self.buf[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.total += 1
+    
+    def view(self) -> np.ndarray:
+        """
+        Return samples oldest first.
+        
+        No copy is made until the buffer has wrapped; after that the samples are
+        unwrapped into a preallocated scratch array, which the next call reuses.
+        """
+        if self.count < self.capacity:
+            return self.buf[:self.count]
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]), out=self.scratch)
+
+
 # Global storage for plotting data
 # OD channels will be dynamically added based on config
 _plot_data = {
-    'time': deque(maxlen=1000),
-    'temperature': deque(maxlen=1000),
+    'time': _RingBuffer(dtype=np.float64),
+    'temperature': _RingBuffer(),
 }
-PLOT_DATA_MAXLEN = 1000
 
-# Global figure and axes for plotting
+# Global figure, axes and line artists for plotting
 _plot_fig = None
 _plot_axes = None
+_plot_lines = {}
+_plot_backgrounds = None  # Cached axes backgrounds for blitting
+
+# Redraw bookkeeping, kept by whichever thread draws (see _process_plot_samples)
+_plot_redraw_pending = False
+_plot_fresh_data = False
+_plot_last_draw = 0.0
+_plot_closed = False  # The user closed the window; set until stop_live_plot
+
+# Samples waiting for the plot thread, which owns the figure. Only used with a
+# non-interactive backend: GUI backends (TkAgg, macOS, ...) must not be driven
+# from a background thread, so with those the caller draws inline instead
+_NON_INTERACTIVE_BACKENDS = frozenset({'agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template'})
+_plot_threaded = None  # Resolved from the backend on first use
+_plot_queue = queue.Queue(maxsize=8)
+_plot_thread = None
+_PLOT_STOP = object()  # Queued by stop_live_plot to end the plot thread
+
+
+def _padded_limits(lo: float, hi: float, data_lo: float, data_hi: float):
+    """
+    Return new (lo, hi) axis limits if the data has left the current view or
+    shrunk to less than half of it, otherwise None.
+    
+    The new limits leave 10% headroom either side so that a steadily growing
+    series only forces a full redraw every few dozen samples.
+    """
+    span = data_hi - data_lo
+    # A flat series never fills half the view, so only its leaving the view counts
+    if data_lo >= lo and data_hi <= hi and (span == 0 or span >= 0.5 * (hi - lo)):
+        return None
+    pad = 0.1 * span or 0.5
+    limits = (data_lo - pad, data_hi + pad)
+    return None if limits == (lo, hi) else limits
+
+
+def _rescale_axes(ax) -> bool:
+    """Fit the axes limits to their line data; return True if they changed."""
+    ax.relim()
+    points = ax.dataLim.get_points()
+    if not np.isfinite(points).all():
+        return False
+    (data_x0, data_y0), (data_x1, data_y1) = points
+    xlim = _padded_limits(*ax.get_xlim(), data_x0, data_x1)
+    ylim = _padded_limits(*ax.get_ylim(), data_y0, data_y1)
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    return xlim is not None or ylim is not None
+
+
+def _append_plot_sample(od_plot_keys: dict, sensor_data: dict) -> bool:
+    """
+    Append one set of readings from measure_and_plot_sensors to the plot history.
+    
+    Returns True if any reading is a number, i.e. the sample adds something visible.
+    """
+    _plot_data['time'].append(sensor_data['elapsed_time'])
+    value = sensor_data['temperature']
+    _plot_data['temperature'].append(value)
+    fresh = value == value  # NaN != NaN
+    for plot_key in od_plot_keys.values():
+        if plot_key not in _plot_data:
+            _plot_data[plot_key] = _RingBuffer()
+        value = sensor_data[plot_key]
+        _plot_data[plot_key].append(value)
+        fresh = fresh or value == value
+    return fresh
+
+
+def _draw_plot_lines() -> None:
+    """Draw the (animated) plot lines onto the canvas renderer."""
+    for line in _plot_lines.values():
+        line.axes.draw_artist(line)
+
+
+def _on_plot_draw(event) -> None:
+    """draw_event handler: cache the freshly drawn axes backgrounds and put the lines back."""
+    global _plot_backgrounds
+    canvas = _plot_fig.canvas
+    _plot_backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in _plot_axes]
+    _draw_plot_lines()
+
+
+def _draw_plot(od_plot_keys: dict) -> None:
+    """Create the live figure on first use, then blit the latest plot history onto it."""
+    global _plot_fig, _plot_axes
+    
+    # Initialize figure and line artists once; later ticks only swap their data
+    if _plot_fig is None:
+        _plot_fig, _plot_axes = plt.subplots(1, 2, figsize=(14, 5))
+        _plot_fig.suptitle('Live Sensor Monitoring', fontsize=14)
+        # Lines are drawn by blitting onto a cached background, so keep
+        # them out of full redraws unless the backend cannot blit
+        animated = _plot_fig.canvas.supports_blit
+        
+        # Left: Temperature
+        ax1 = _plot_axes[0]
+        ax1.set_title('Temperature')
+        ax1.set_xlabel('Time (seconds)')
+        ax1.set_ylabel('Temperature (°C)')
+        ax1.grid(True, alpha=0.3)
+        _plot_lines['temperature'], = ax1.plot([], [], 'g-', linewidth=2, label='Temperature', animated=animated)
+        ax1.legend()
+        
+        # Right: OD voltages (dynamically plot all configured channels)
+        ax2 = _plot_axes[1]
+        ax2.set_title('Optical Density Voltages')
+        ax2.set_xlabel('Time (seconds)')
+        ax2.set_ylabel('Voltage (V)')
+        ax2.grid(True, alpha=0.3)
+        
+        # Plot colors for different channels
+        colors = ['m', 'c', 'b', 'r', 'g', 'y', 'k']
+        for idx, (ch_name, plot_key) in enumerate(od_plot_keys.items()):
+            color = colors[idx % len(colors)]
+            _plot_lines[plot_key], = ax2.plot([], [], f'{color}-', linewidth=2, label=ch_name,
+                                                            animated=animated)
+        ax2.legend()
+        
+        # Solve the layout once; titles and labels never change afterwards
+        _plot_fig.tight_layout()
+        if animated:
+            # Any full draw (rescale, resize, GUI repaint) wipes the animated lines
+            # and may change the axes size, so re-cache the backgrounds after it
+            _plot_fig.canvas.mpl_connect('draw_event', _on_plot_draw)
+        plt.ion()  # Turn on interactive mode
+        plt.show(block=False)
+    
+    canvas = _plot_fig.canvas
+    time_buf = _plot_data['time']
+    time_view = time_buf.view()
+    # Plot every step-th sample, picked by absolute sample number so the same
+    # points stay on screen as the window slides, plus always the newest sample
+    step = max(1, len(time_view) // PLOT_MAX_POINTS)
+    first = -(time_buf.total - len(time_view)) % step
+    for plot_key, line in _plot_lines.items():
+        values = _plot_data[plot_key].view()
+        start = len(time_view) - len(values)
+        offset = (first - start) % step
+        xs = time_view[start + offset::step]
+        ys = values[offset::step]
+        if (len(values) - 1 - offset) % step:
+            xs = np.append(xs, time_view[-1])
+            ys = np.append(ys, values[-1])
+        line.set_data(xs, ys)
+    rescaled = [_rescale_axes(ax) for ax in _plot_axes]
+    
+    if not canvas.supports_blit:
+        canvas.draw_idle()
+    else:
+        if _plot_backgrounds is None or any(rescaled):
+            # Limits (and so ticks) changed: redraw the static artists; the
+            # draw_event handler caches the new backgrounds and draws the lines
+            canvas.draw()
+        else:
+            for background in _plot_backgrounds:
+                canvas.restore_region(background)
+            _draw_plot_lines()
+        for ax in _plot_axes:
+            canvas.blit(ax.bbox)
+    canvas.flush_events()
+
+
+def _process_plot_samples(samples) -> None:
+    """
+    Append samples to the plot history and redraw if one is due.
+    
+    Redraws are held back to at most one every PLOT_MIN_INTERVAL seconds; a redraw
+    requested sooner is done once it elapses. While every sensor reads NaN (e.g.
+    offline) there is nothing new to show, so redraws wait until a real reading
+    arrives.
+    """
+    global _plot_redraw_pending, _plot_fresh_data, _plot_last_draw
+    od_plot_keys = {}
+    for od_plot_keys, sensor_data, sample_redraw in samples:
+        _plot_fresh_data = _append_plot_sample(od_plot_keys, sensor_data) or _plot_fresh_data
+        _plot_redraw_pending = _plot_redraw_pending or sample_redraw
+    now = time.monotonic()
+    if (_plot_redraw_pending and _plot_fresh_data and now - _plot_last_draw >= PLOT_MIN_INTERVAL
+            and len(_plot_data['time']) > 1):
+        _draw_plot(od_plot_keys)
+        _plot_redraw_pending = False
+        _plot_fresh_data = False
+        _plot_last_draw = now
+    elif _plot_fig is not None:
+        _plot_fig.canvas.flush_events()
+
+
+def _plot_window_open() -> bool:
+    """Return False (and drop the figure) once the user has closed the live plot window."""
+    global _plot_closed
+    if _plot_fig is None or plt.fignum_exists(_plot_fig.number):
+        return True
+    # Stop plotting rather than reopen the window
+    logger.info("Live plot window closed; plotting stopped.")
+    _close_plot()
+    _plot_closed = True
+    return False
+
+
+def _plot_in_thread() -> bool:
+    """Return True if the matplotlib backend is non-interactive, so the plot thread may draw."""
+    global _plot_threaded
+    if _plot_threaded is None:
+        _plot_threaded = matplotlib.get_backend().lower() in _NON_INTERACTIVE_BACKENDS
+    return _plot_threaded
+
+
+def _plot_worker() -> None:
+    """
+    Own the live figure: consume samples from _plot_queue, update the plot history
+    and redraw, and service the figure's events between samples.
+    
+    Only started with a non-interactive backend (see _plot_in_thread); all
+    matplotlib calls then happen on this thread so that sensor jobs never wait on
+    rendering.
+    """
+    while True:
+        try:
+            if _plot_fig is None:
+                samples = [_plot_queue.get()]
+            elif not _plot_window_open():
+                return
+            else:
+                # Service figure events while waiting for the next sample
+                _plot_fig.canvas.start_event_loop(0.05)
+                samples = []
+            while True:
+                try:
+                    samples.append(_plot_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if any(sample is _PLOT_STOP for sample in samples):
+                _close_plot()
+                return
+            _process_plot_samples(samples)
+        except Exception as e:
+            logger.error(f"Error updating live plot: {e}")
+            # Back off so a persistent failure doesn't become a busy loop
+            time.sleep(PLOT_ERROR_BACKOFF)
+
+
+def _close_plot() -> None:
+    """Close the live figure (if any) and forget its artists; runs on the drawing thread."""
+    global _plot_fig, _plot_axes, _plot_backgrounds
+    if _plot_fig is not None:
+        try:
+            plt.close(_plot_fig)
+        except Exception as e:
+            logger.error(f"Error closing live plot: {e}")
+    _plot_fig = None
+    _plot_axes = None
+    _plot_lines.clear()
+    _plot_backgrounds = None
+
+
+def _submit_plot_sample(sample) -> None:
+    """
+    Hand a sample to the live plot without blocking on rendering where possible.
+    
+    With a non-interactive backend the sample is queued for the plot thread, which
+    is started on first use. GUI backends must stay on one thread, so there the
+    sample is plotted inline on the calling thread.
+    """
+    global _plot_thread
+    if _plot_closed:
+        return  # Plot window was closed; see stop_live_plot to start afresh
+    if not _plot_in_thread():
+        try:
+            if _plot_window_open():
+                _process_plot_samples([sample])
+        except Exception as e:
+            logger.error(f"Error updating live plot: {e}")
+        return
+    if _plot_thread is None:
+        _plot_thread = threading.Thread(target=_plot_worker, name="Bioreactor-Plot", daemon=True)
+        _plot_thread.start()
+    _put_plot_queue(sample)
+
+
+def stop_live_plot(timeout: float = 2.0) -> None:
+    """
+    Stop the plot thread (if any) and close the live figure, if plotting was started.
+    
+    Called by Bioreactor.finish(); a later measure_and_plot_sensors call opens a new figure.
+    
+    Args:
+        timeout: Seconds to wait for the plot thread to finish
+    """
+    global _plot_thread, _plot_closed
+    thread = _plot_thread
+    if thread is None:
+        # Drawn inline (or never started): close the figure here
+        _close_plot()
+        _plot_closed = False
+        return
+    if thread.is_alive():
+        _put_plot_queue(_PLOT_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Live plot thread did not stop in time.")
+            return
+    # Drop samples left over from this session before a new thread can start
+    while True:
+        try:
+            _plot_queue.get_nowait()
+        except queue.Empty:
+            break
+    _plot_thread = None
+    _plot_closed = False
+
+
+def _put_plot_queue(item) -> None:
+    """Put an item on _plot_queue, dropping the oldest entry if it is full."""
+    try:
+        _plot_queue.put_nowait(item)
+    except queue.Full:
+        # Plotting has fallen behind: drop the oldest sample rather than stall the caller
+        try:
+            _plot_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            _plot_queue.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def _write_csv_row(bioreactor, sensor_data: dict) -> None:
+    """
+    Write one row of readings to the bioreactor's CSV file.
+    
+    The row is built straight in column order by bioreactor._csv_row_fn; columns
+    without a reading, or whose component is not initialized, are left empty, so
+    NaN only marks a failed reading from a working component. Rows are buffered
+    by the bioreactor and reach the file in batches (see Bioreactor.write_row).
+    """
+    if not bioreactor._caps & CAP_WRITER:
+        return
+    
+    # Actual timestamp, then one value per remaining column
+    bioreactor.write_row(bioreactor._csv_row_fn(datetime.now().strftime('%Y-%m-%d %H:%M:%S'), sensor_data,
+                                                bioreactor._caps))
 
 
-def measure_and_plot_sensors(bioreactor, elapsed: Optional[float] = None, led_power: float = 30.0, averaging_duration: float = 0.5):
+def measure_and_plot_sensors(bioreactor, elapsed: Optional[float] = None, led_power: float = 30.0, averaging_duration: float = 0.5,
+                             plot_every: int = 5, min_delta: Optional[float] = None,
+                             agg_k: Optional[int] = None):
     """
     Measure, record, and plot sensor data from OD channels and Temperature.
     
@@ -41,182 +454,109 @@ def measure_and_plot_sensors(bioreactor, elapsed: Optional[float] = None, led_po
         elapsed: Elapsed time in seconds (if None, uses time since start)
         led_power: LED power percentage for OD measurements (default: 30.0)
         averaging_duration: Duration in seconds for averaging OD measurements (default: 0.5)
+        plot_every: Redraw the plots every Nth call (default: 5). Readings are still
+                    recorded to CSV and the plot history on every call.
+        min_delta: Skip writing and plotting a sample when temperature and every OD
+                   reading moved less than this since the last kept sample
+                   (default: None, falls back to config.DEDUP_MIN_DELTA; None keeps every sample)
+        agg_k: Record and plot one sample per agg_k calls, holding the mean of elapsed time,
+               temperature and each OD reading over those calls; NaN readings are left out
+               of the mean (default: None, falls back to config.AGG_SAMPLES; None or 1
+               records every call)
         
     Returns:
         dict: Dictionary with all sensor readings
     """
-    global _plot_fig, _plot_axes
-    
-    # Import IO functions
-    from .io import get_temperature, read_voltage, measure_od
+    # Bind the logger to a local once per call
+    log = bioreactor.logger
     
     # Get elapsed time
     if elapsed is None:
-        if not hasattr(bioreactor, '_start_time'):
-            bioreactor._start_time = time.time()
-        elapsed = time.time() - bioreactor._start_time
-    
-    # Get config
-    config = getattr(bioreactor, 'cfg', None)
-    
-    # Get OD channel names from config (keys of OD_ADC_CHANNELS dict)
-    od_channel_names = []
-    if config and hasattr(config, 'OD_ADC_CHANNELS'):
-        od_channel_names = list(config.OD_ADC_CHANNELS.keys())
-    elif hasattr(bioreactor, 'od_channels'):
-        # Fallback: use channel names from initialized od_channels
-        od_channel_names = list(bioreactor.od_channels.keys())
-    
-    # Initialize plot data storage for OD channels dynamically
-    for ch_name in od_channel_names:
-        plot_key = f"od_{ch_name.lower()}"
-        if plot_key not in _plot_data:
-            _plot_data[plot_key] = deque(maxlen=PLOT_DATA_MAXLEN)
+        start_time = getattr(bioreactor, '_start_time', None)
+        if start_time is None:
+            start_time = bioreactor._start_time = time.monotonic()
+        elapsed = time.monotonic() - start_time
+    
+    # {channel: sensor_data key} for the OD channels (see Bioreactor.__init__)
+    od_plot_keys = bioreactor._od_plot_keys
     
     # Read sensors
     sensor_data = {'elapsed_time': elapsed}
     
-    # Read Temperature
-    temp_value = get_temperature(bioreactor, sensor_index=0)
-    if not np.isnan(temp_value):
-        sensor_data['temperature'] = temp_value
-        _plot_data['temperature'].append(temp_value)
-    else:
-        sensor_data['temperature'] = float('nan')
-        _plot_data['temperature'].append(float('nan'))
+    # Read Temperature (get_temperature already returns NaN when unavailable)
+    sensor_data['temperature'] = get_temperature(bioreactor, sensor_index=0)
     
     # Read OD channels dynamically based on config
-    if bioreactor.is_component_initialized('led') and bioreactor.is_component_initialized('optical_density'):
+    caps = bioreactor._caps
+    od_initialized = caps & CAP_OD
+    if od_initialized and caps & CAP_LED:
         # Measure OD with LED on
         od_results = measure_od(bioreactor, led_power=led_power, averaging_duration=averaging_duration, channel_name='all')
-        if od_results and od_channel_names:
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
-                od_value = od_results.get(ch_name, None)
-                if od_value is not None:
-                    sensor_data[plot_key] = od_value
-                    _plot_data[plot_key].append(od_value)
-                else:
-                    sensor_data[plot_key] = float('nan')
-                    _plot_data[plot_key].append(float('nan'))
+        if od_results and od_plot_keys:
+            for ch_name, plot_key in od_plot_keys.items():
+                sensor_data[plot_key] = od_results.get(ch_name, _NAN)
         else:
             # No results, set all to NaN
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
-                sensor_data[plot_key] = float('nan')
-                _plot_data[plot_key].append(float('nan'))
+            sensor_data.update(bioreactor._nan_od_template)
     else:
         # Try reading without LED if OD sensor is available but LED is not
-        if bioreactor.is_component_initialized('optical_density') and od_channel_names:
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
+        if od_initialized and od_plot_keys:
+            for ch_name, plot_key in od_plot_keys.items():
                 od_value = read_voltage(bioreactor, ch_name)
-                sensor_data[plot_key] = od_value if od_value is not None else float('nan')
-                _plot_data[plot_key].append(sensor_data[plot_key])
+                sensor_data[plot_key] = od_value if od_value is not None else _NAN
         else:
             # No OD available, set all to NaN
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
-                sensor_data[plot_key] = float('nan')
-                _plot_data[plot_key].append(float('nan'))
-    
-    # Add time to plot data
-    _plot_data['time'].append(elapsed)
+            sensor_data.update(bioreactor._nan_od_template)
+    
+    # Average every agg_k calls into one recorded sample
+    if agg_k is None:
+        agg_k = getattr(getattr(bioreactor, 'cfg', None), 'AGG_SAMPLES', None)
+    if agg_k is not None and agg_k > 1:
+        window = getattr(bioreactor, '_agg_window', None)
+        if window is None:
+            window = bioreactor._agg_window = []
+        window.append(sensor_data)
+        if len(window) < agg_k:
+            return sensor_data
+        keys = ('elapsed_time', 'temperature', *od_plot_keys.values())
+        samples = np.array([[sample[key] for key in keys] for sample in window], dtype=np.float64)
+        window.clear()
+        valid = ~np.isnan(samples)
+        with np.errstate(invalid='ignore'):
+            means = np.where(valid, samples, 0.0).sum(axis=0) / valid.sum(axis=0)
+        sensor_data = dict(zip(keys, means.tolist()))
+    
+    # Drop samples that haven't moved since the last kept one (steady state)
+    if min_delta is None:
+        min_delta = getattr(getattr(bioreactor, 'cfg', None), 'DEDUP_MIN_DELTA', None)
+    if min_delta is not None:
+        last_sample = getattr(bioreactor, '_last_sample', None)
+        if last_sample is not None and all(
+            abs(sensor_data[key] - last_sample[key]) < min_delta for key in last_sample
+        ):
+            return sensor_data
+        bioreactor._last_sample = {
+            key: sensor_data[key] for key in ('temperature', *od_plot_keys.values())
+        }
     
     # Write to CSV
-    if hasattr(bioreactor, 'writer') and bioreactor.writer:
-        # Get current timestamp
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        csv_row = {
-            'time': current_time,  # Actual timestamp
-            'elapsed_time': elapsed  # Elapsed seconds since start
-        }
-        
-        # Add temperature with config label if available
-        if config and hasattr(config, 'SENSOR_LABELS'):
-            temp_label = config.SENSOR_LABELS.get('temperature', 'temperature_C')
-            csv_row[temp_label] = sensor_data['temperature']
-        else:
-            csv_row['temperature'] = sensor_data['temperature']
-        
-        # Add OD data dynamically using config labels or auto-generate
-        for ch_name in od_channel_names:
-            plot_key = f"od_{ch_name.lower()}"
+    _write_csv_row(bioreactor, sensor_data)
+    
+    # Hand the readings to the live plot (see _submit_plot_sample); redraw only every
+    # plot_every calls since redrawing dominates the call time. Without a temperature
+    # sensor or OD there is nothing to plot, so the figure is never created
+    if caps & (CAP_TEMP | CAP_OD):
+        plot_tick = getattr(bioreactor, '_plot_tick', 0)
+        bioreactor._plot_tick = plot_tick + 1
+        _submit_plot_sample((od_plot_keys, dict(sensor_data), plot_tick % plot_every == 0))
+    
+    # Build log message dynamically (skipped entirely when INFO is disabled)
+    if log.isEnabledFor(logging.INFO):
+        log_parts = [_TEMP_LOG_FMT.format(sensor_data['temperature'])]
+        for plot_key, fmt in bioreactor._od_log_fmts:
             if plot_key in sensor_data:
-                # Try to get label from SENSOR_LABELS first
-                if config and hasattr(config, 'SENSOR_LABELS'):
-                    # Try multiple possible label keys
-                    label = (config.SENSOR_LABELS.get(plot_key) or 
-                            config.SENSOR_LABELS.get(f"od_{ch_name}") or
-                            config.SENSOR_LABELS.get(f"od_{ch_name.lower()}") or
-                            config.SENSOR_LABELS.get(f"od_{ch_name.upper()}") or
-                            f"OD_{ch_name}_V")
-                else:
-                    # Auto-generate label
-                    label = f"OD_{ch_name}_V"
-                csv_row[label] = sensor_data[plot_key]
-        
-        try:
-            # Only write fields that exist in fieldnames to avoid errors
-            if hasattr(bioreactor, 'fieldnames'):
-                filtered_row = {k: v for k, v in csv_row.items() if k in bioreactor.fieldnames}
-                bioreactor.writer.writerow(filtered_row)
-            else:
-                bioreactor.writer.writerow(csv_row)
-            if hasattr(bioreactor, 'out_file'):
-                bioreactor.out_file.flush()
-        except Exception as e:
-            bioreactor.logger.error(f"Error writing to CSV: {e}")
-    
-    # Update plots
-    if len(_plot_data['time']) > 1:
-        # Initialize figure if needed
-        if _plot_fig is None:
-            _plot_fig, _plot_axes = plt.subplots(1, 2, figsize=(14, 5))
-            _plot_fig.suptitle('Live Sensor Monitoring', fontsize=14)
-            plt.ion()  # Turn on interactive mode
-            plt.show(block=False)
-        
-        # Left: Temperature
-        ax1 = _plot_axes[0]
-        ax1.clear()
-        ax1.set_title('Temperature')
-        ax1.set_xlabel('Time (seconds)')
-        ax1.set_ylabel('Temperature (°C)')
-        ax1.grid(True, alpha=0.3)
-        if len(_plot_data['temperature']) > 0:
-            ax1.plot(list(_plot_data['time']), list(_plot_data['temperature']), 'g-', linewidth=2, label='Temperature')
-        ax1.legend()
-        
-        # Right: OD voltages (dynamically plot all configured channels)
-        ax2 = _plot_axes[1]
-        ax2.clear()
-        ax2.set_title('Optical Density Voltages')
-        ax2.set_xlabel('Time (seconds)')
-        ax2.set_ylabel('Voltage (V)')
-        ax2.grid(True, alpha=0.3)
-        
-        # Plot colors for different channels
-        colors = ['m', 'c', 'b', 'r', 'g', 'y', 'k']
-        for idx, ch_name in enumerate(od_channel_names):
-            plot_key = f"od_{ch_name.lower()}"
-            if plot_key in _plot_data and len(_plot_data[plot_key]) > 0:
-                color = colors[idx % len(colors)]
-                ax2.plot(list(_plot_data['time']), list(_plot_data[plot_key]), 
-                        f'{color}-', linewidth=2, label=ch_name)
-        ax2.legend()
-        
-        plt.tight_layout()
-        plt.draw()
-        plt.pause(0.01)  # Small pause to update display
-    
-    # Build log message dynamically
-    log_parts = [f"Temp: {sensor_data.get('temperature', 'N/A'):.2f}°C"]
-    for ch_name in od_channel_names:
-        plot_key = f"od_{ch_name.lower()}"
-        if plot_key in sensor_data:
-            log_parts.append(f"OD {ch_name}: {sensor_data.get(plot_key, 'N/A'):.4f}V")
-    bioreactor.logger.info(f"Sensor readings - {', '.join(log_parts)}")
+                log_parts.append(fmt.format(sensor_data[plot_key]))
+        log.info("Sensor readings - " + ", ".join(log_parts))
     
     return sensor_data
 
@@ -238,100 +578,87 @@ def measure_and_record_sensors(bioreactor, elapsed: Optional[float] = None, led_
     Returns:
         dict: Dictionary with all sensor readings
     """
-    # Import IO functions
-    from .io import get_temperature, read_voltage, measure_od, read_all_eyespy_boards, read_eyespy_voltage, read_eyespy_adc, read_co2, read_o2, get_peltier_state, get_ring_light_color
+    # Bind hot names to locals once per call
+    log = bioreactor.logger
+    isnan = math.isnan
     
     # Get elapsed time
     if elapsed is None:
-        if not hasattr(bioreactor, '_start_time'):
-            bioreactor._start_time = time.time()
-        elapsed = time.time() - bioreactor._start_time
-    
-    # Get config
-    config = getattr(bioreactor, 'cfg', None)
-    
-    # Get OD channel names from config (keys of OD_ADC_CHANNELS dict)
-    od_channel_names = []
-    if config and hasattr(config, 'OD_ADC_CHANNELS'):
-        od_channel_names = list(config.OD_ADC_CHANNELS.keys())
-    elif hasattr(bioreactor, 'od_channels'):
-        # Fallback: use channel names from initialized od_channels
-        od_channel_names = list(bioreactor.od_channels.keys())
+        start_time = getattr(bioreactor, '_start_time', None)
+        if start_time is None:
+            start_time = bioreactor._start_time = time.monotonic()
+        elapsed = time.monotonic() - start_time
+    
+    # {channel: sensor_data key} for the OD channels (see Bioreactor.__init__)
+    od_plot_keys = bioreactor._od_plot_keys
+    
+    # Look up component state once for the whole call
+    caps = bioreactor._caps
+    temp_initialized = caps & CAP_TEMP
+    led_initialized = caps & CAP_LED
+    od_initialized = caps & CAP_OD
+    eyespy_initialized = caps & CAP_EYESPY
+    co2_initialized = caps & CAP_CO2
+    o2_initialized = caps & CAP_O2
+    peltier_initialized = caps & CAP_PELTIER
+    ring_light_initialized = caps & CAP_RING_LIGHT
+    eyespy_boards = getattr(bioreactor, 'eyespy_boards', None) if eyespy_initialized else None
+    eyespy_keys = bioreactor._eyespy_keys if eyespy_boards is not None else {}
     
     # Read sensors
     sensor_data = {'elapsed_time': elapsed}
     
     # Read Temperature only if temp_sensor is initialized
-    if bioreactor.is_component_initialized('temp_sensor'):
-        temp_value = get_temperature(bioreactor, sensor_index=0)
-        if not np.isnan(temp_value):
-            sensor_data['temperature'] = temp_value
-        else:
-            sensor_data['temperature'] = float('nan')
+    if temp_initialized:
+        sensor_data['temperature'] = get_temperature(bioreactor, sensor_index=0)
     
     # Read OD channels and/or eyespy with LED on if LED is initialized
     # measure_od() handles turning LED on, taking readings, and turning LED off
     # It works with OD only, eyespy only, or both
-    led_initialized = bioreactor.is_component_initialized('led')
-    od_initialized = bioreactor.is_component_initialized('optical_density')
-    eyespy_initialized = bioreactor.is_component_initialized('eyespy_adc')
-    
     if led_initialized and (od_initialized or eyespy_initialized):
         # Measure with LED on (reads OD channels and/or eyespy if initialized)
-        od_results = measure_od(bioreactor, led_power=led_power, averaging_duration=averaging_duration, channel_name='all')
+        eyespy_raw = {}
+        od_results = measure_od(bioreactor, led_power=led_power, averaging_duration=averaging_duration, channel_name='all',
+                                raw_out=eyespy_raw)
         if od_results:
             # Extract OD channel readings (if OD is initialized)
-            if od_initialized and od_channel_names:
-                for ch_name in od_channel_names:
-                    plot_key = f"od_{ch_name.lower()}"
-                    od_value = od_results.get(ch_name, None)
-                    if od_value is not None:
-                        sensor_data[plot_key] = od_value
-                    else:
-                        sensor_data[plot_key] = float('nan')
-            elif od_channel_names:
+            if od_initialized and od_plot_keys:
+                for ch_name, plot_key in od_plot_keys.items():
+                    sensor_data[plot_key] = od_results.get(ch_name, _NAN)
+            elif od_plot_keys:
                 # OD channels requested but not initialized - set to NaN
-                for ch_name in od_channel_names:
-                    plot_key = f"od_{ch_name.lower()}"
-                    sensor_data[plot_key] = float('nan')
+                sensor_data.update(bioreactor._nan_od_template)
             
             # Extract eyespy readings from od_results (averaged voltages with LED on)
-            if eyespy_initialized and hasattr(bioreactor, 'eyespy_boards'):
-                for board_name in bioreactor.eyespy_boards.keys():
+            if eyespy_boards is not None:
+                for board_name, (voltage_key, raw_key) in eyespy_keys.items():
                     eyespy_voltage = od_results.get(board_name, None)
                     if eyespy_voltage is not None:
                         # Store the averaged voltage from measure_od (LED was on during measurement)
-                        sensor_data[f"eyespy_{board_name}_voltage"] = eyespy_voltage
-                        # Also get raw value for completeness (single reading after LED is off)
+                        sensor_data[voltage_key] = eyespy_voltage
+                        # Also store the last raw value taken during the same measurement window
                         # Note: This raw value is NOT used to recalculate voltage - the averaged voltage above is used
-                        raw_value = read_eyespy_adc(bioreactor, board_name)
-                        sensor_data[f"eyespy_{board_name}_raw"] = raw_value if raw_value is not None else float('nan')
+                        sensor_data[raw_key] = eyespy_raw.get(board_name, _NAN)
                     else:
-                        sensor_data[f"eyespy_{board_name}_voltage"] = float('nan')
-                        sensor_data[f"eyespy_{board_name}_raw"] = float('nan')
+                        sensor_data[voltage_key] = _NAN
+                        sensor_data[raw_key] = _NAN
         else:
             # No results, set all to NaN
-            if od_channel_names:
-                for ch_name in od_channel_names:
-                    plot_key = f"od_{ch_name.lower()}"
-                    sensor_data[plot_key] = float('nan')
+            sensor_data.update(bioreactor._nan_od_template)
             # Also set eyespy to NaN if initialized
-            if eyespy_initialized and hasattr(bioreactor, 'eyespy_boards'):
-                for board_name in bioreactor.eyespy_boards.keys():
-                    sensor_data[f"eyespy_{board_name}_voltage"] = float('nan')
-                    sensor_data[f"eyespy_{board_name}_raw"] = float('nan')
+            if eyespy_boards is not None:
+                for voltage_key, raw_key in eyespy_keys.values():
+                    sensor_data[voltage_key] = _NAN
+                    sensor_data[raw_key] = _NAN
     else:
         # Try reading without LED if OD sensor is available but LED is not
-        if bioreactor.is_component_initialized('optical_density') and od_channel_names:
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
+        if od_initialized and od_plot_keys:
+            for ch_name, plot_key in od_plot_keys.items():
                 od_value = read_voltage(bioreactor, ch_name)
-                sensor_data[plot_key] = od_value if od_value is not None else float('nan')
+                sensor_data[plot_key] = od_value if od_value is not None else _NAN
         else:
             # No OD available, set all to NaN
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
-                sensor_data[plot_key] = float('nan')
+            sensor_data.update(bioreactor._nan_od_template)
     
     # Eyespy ADC readings when LED is not initialized (read separately without LED)
     # Note: If LED is initialized, eyespy should have been read above via measure_od()
@@ -339,238 +666,179 @@ def measure_and_record_sensors(bioreactor, elapsed: Optional[float] = None, led_
         eyespy_readings = read_all_eyespy_boards(bioreactor)
         if eyespy_readings:
             for board_name, raw_value in eyespy_readings.items():
+                voltage_key, raw_key = eyespy_keys[board_name]
                 if raw_value is not None:
                     # Store raw value
-                    sensor_data[f"eyespy_{board_name}_raw"] = raw_value
+                    sensor_data[raw_key] = raw_value
                     # Also get voltage (single reading, LED off)
                     voltage = read_eyespy_voltage(bioreactor, board_name)
-                    if voltage is not None:
-                        sensor_data[f"eyespy_{board_name}_voltage"] = voltage
-                    else:
-                        sensor_data[f"eyespy_{board_name}_voltage"] = float('nan')
+                    sensor_data[voltage_key] = voltage if voltage is not None else _NAN
                 else:
-                    sensor_data[f"eyespy_{board_name}_raw"] = float('nan')
-                    sensor_data[f"eyespy_{board_name}_voltage"] = float('nan')
+                    sensor_data[raw_key] = _NAN
+                    sensor_data[voltage_key] = _NAN
+    
+    # CO2, O2, peltier and ring light read NaN when their component is not
+    # initialized; _write_csv_row leaves those CSV cells empty
     
     # Read CO2 sensor if initialized
-    if bioreactor.is_component_initialized('co2_sensor'):
+    if co2_initialized:
+        # read_co2 already returns value multiplied by 10 to get PPM
         co2_value = read_co2(bioreactor)
-        if co2_value is not None:
-            # read_co2 already returns value multiplied by 10 to get PPM
-            sensor_data['co2'] = co2_value
-        else:
-            sensor_data['co2'] = float('nan')
+        sensor_data['co2'] = co2_value if co2_value is not None else _NAN
     else:
-        sensor_data['co2'] = float('nan')
+        sensor_data['co2'] = _NAN
     
     # Read O2 sensor if initialized
-    if bioreactor.is_component_initialized('o2_sensor'):
+    if o2_initialized:
         o2_value = read_o2(bioreactor)
-        if o2_value is not None:
-            sensor_data['o2'] = o2_value
-        else:
-            sensor_data['o2'] = float('nan')
+        sensor_data['o2'] = o2_value if o2_value is not None else _NAN
     else:
-        sensor_data['o2'] = float('nan')
+        sensor_data['o2'] = _NAN
     
     # Current peltier duty and direction (from driver state, not a sensor)
-    if bioreactor.is_component_initialized('peltier_driver'):
+    if peltier_initialized:
         peltier_state = get_peltier_state(bioreactor)
         if peltier_state is not None:
             duty, forward = peltier_state
             sensor_data['peltier_duty'] = duty
             sensor_data['peltier_forward'] = 1.0 if forward else 0.0
         else:
-            sensor_data['peltier_duty'] = float('nan')
-            sensor_data['peltier_forward'] = float('nan')
+            sensor_data['peltier_duty'] = _NAN
+            sensor_data['peltier_forward'] = _NAN
     else:
-        sensor_data['peltier_duty'] = float('nan')
-        sensor_data['peltier_forward'] = float('nan')
+        sensor_data['peltier_duty'] = _NAN
+        sensor_data['peltier_forward'] = _NAN
     
     # Current ring light color (R, G, B 0-255)
-    if bioreactor.is_component_initialized('ring_light'):
+    if ring_light_initialized:
         ring_color = get_ring_light_color(bioreactor)
         if ring_color is not None:
             sensor_data['ring_light_R'] = float(ring_color[0])
             sensor_data['ring_light_G'] = float(ring_color[1])
             sensor_data['ring_light_B'] = float(ring_color[2])
         else:
-            sensor_data['ring_light_R'] = float('nan')
-            sensor_data['ring_light_G'] = float('nan')
-            sensor_data['ring_light_B'] = float('nan')
+            sensor_data['ring_light_R'] = _NAN
+            sensor_data['ring_light_G'] = _NAN
+            sensor_data['ring_light_B'] = _NAN
     else:
-        sensor_data['ring_light_R'] = float('nan')
-        sensor_data['ring_light_G'] = float('nan')
-        sensor_data['ring_light_B'] = float('nan')
+        sensor_data['ring_light_R'] = _NAN
+        sensor_data['ring_light_G'] = _NAN
+        sensor_data['ring_light_B'] = _NAN
     
     # Write to CSV
-    if hasattr(bioreactor, 'writer') and bioreactor.writer:
-        # Get current timestamp
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        csv_row = {
-            'time': current_time,  # Actual timestamp
-            'elapsed_time': elapsed  # Elapsed seconds since start
-        }
+    _write_csv_row(bioreactor, sensor_data)
+    
+    # Build log message dynamically (only include initialized sensors; skipped
+    # entirely when INFO is disabled)
+    if log.isEnabledFor(logging.INFO):
+        log_parts = []
         
-        # Add temperature with config label if temp_sensor is initialized
-        if bioreactor.is_component_initialized('temp_sensor') and 'temperature' in sensor_data:
-            if config and hasattr(config, 'SENSOR_LABELS'):
-                temp_label = config.SENSOR_LABELS.get('temperature', 'temperature_C')
-            else:
-                temp_label = 'temperature_C'
-            csv_row[temp_label] = sensor_data['temperature']
+        # Add temperature to log only if temp_sensor is initialized
+        if temp_initialized and 'temperature' in sensor_data:
+            temp_value = sensor_data.get('temperature', _NAN)
+            if not isnan(temp_value):
+                log_parts.append(_TEMP_LOG_FMT.format(temp_value))
         
-        # Add OD data dynamically using config labels or auto-generate (only if optical_density is initialized)
-        if bioreactor.is_component_initialized('optical_density'):
-            for ch_name in od_channel_names:
-                plot_key = f"od_{ch_name.lower()}"
+        # Add OD channels to log only if optical_density is initialized
+        if od_initialized:
+            for plot_key, fmt in bioreactor._od_log_fmts:
                 if plot_key in sensor_data:
-                    # Try to get label from SENSOR_LABELS first
-                    if config and hasattr(config, 'SENSOR_LABELS'):
-                        # Try multiple possible label keys
-                        label = (config.SENSOR_LABELS.get(plot_key) or 
-                                config.SENSOR_LABELS.get(f"od_{ch_name}") or
-                                config.SENSOR_LABELS.get(f"od_{ch_name.lower()}") or
-                                config.SENSOR_LABELS.get(f"od_{ch_name.upper()}") or
-                                f"OD_{ch_name}_V")
-                    else:
-                        # Auto-generate label
-                        label = f"OD_{ch_name}_V"
-                    csv_row[label] = sensor_data[plot_key]
+                    od_value = sensor_data.get(plot_key, _NAN)
+                    if not isnan(od_value):
+                        log_parts.append(fmt.format(od_value))
         
-        # Add eyespy ADC data dynamically
-        if bioreactor.is_component_initialized('eyespy_adc') and hasattr(bioreactor, 'eyespy_boards'):
-            for board_name in bioreactor.eyespy_boards.keys():
-                raw_key = f"eyespy_{board_name}_raw"
-                voltage_key = f"eyespy_{board_name}_voltage"
-                
-                # Get labels from config or auto-generate
-                if config and hasattr(config, 'SENSOR_LABELS'):
-                    raw_label = config.SENSOR_LABELS.get(raw_key, f"Eyespy_{board_name}_raw")
-                    voltage_label = config.SENSOR_LABELS.get(voltage_key, f"Eyespy_{board_name}_V")
-                else:
-                    raw_label = f"Eyespy_{board_name}_raw"
-                    voltage_label = f"Eyespy_{board_name}_V"
-                
-                # Write raw value if available
-                if raw_key in sensor_data:
-                    csv_row[raw_label] = sensor_data[raw_key]
-                
-                # Write voltage value - this should be the averaged voltage from measure_od (with LED on)
+        # Add eyespy readings to log
+        if eyespy_boards is not None:
+            for voltage_key, fmt in bioreactor._eyespy_log_fmts:
                 if voltage_key in sensor_data:
-                    voltage_value = sensor_data[voltage_key]
-                    csv_row[voltage_label] = voltage_value
-                    # Debug: verify we're writing the correct averaged value
-                    if not np.isnan(voltage_value):
-                        bioreactor.logger.debug(f"Writing eyespy {board_name} voltage to CSV: {voltage_value:.4f}V (label: {voltage_label})")
+                    voltage = sensor_data[voltage_key]
+                    if not isnan(voltage):
+                        log_parts.append(fmt.format(voltage))
         
-        # Add CO2 data if sensor is initialized
-        if bioreactor.is_component_initialized('co2_sensor') and 'co2' in sensor_data:
-            # Get label from config or auto-generate
-            if config and hasattr(config, 'SENSOR_LABELS'):
-                co2_label = config.SENSOR_LABELS.get('co2', 'CO2_ppm')
-            else:
-                co2_label = 'CO2_ppm'
-            csv_row[co2_label] = sensor_data['co2']
+        # Add CO2 reading to log
+        if co2_initialized and 'co2' in sensor_data:
+            co2_value = sensor_data['co2']
+            if not isnan(co2_value):
+                # Value is already in PPM (multiplied by 10 in read_co2)
+                log_parts.append(_CO2_LOG_FMT.format(co2_value))
         
-        # Add O2 data if sensor is initialized
-        if bioreactor.is_component_initialized('o2_sensor') and 'o2' in sensor_data:
-            # Get label from config or auto-generate
-            if config and hasattr(config, 'SENSOR_LABELS'):
-                o2_label = config.SENSOR_LABELS.get('o2', 'O2_percent')
-            else:
-                o2_label = 'O2_percent'
-            csv_row[o2_label] = sensor_data['o2']
+        # Add O2 reading to log
+        if o2_initialized and 'o2' in sensor_data:
+            o2_value = sensor_data['o2']
+            if not isnan(o2_value):
+                log_parts.append(_O2_LOG_FMT.format(o2_value))
         
-        # Add peltier state if peltier_driver is initialized
-        if bioreactor.is_component_initialized('peltier_driver'):
-            if config and hasattr(config, 'SENSOR_LABELS'):
-                duty_label = config.SENSOR_LABELS.get('peltier_duty', 'peltier_duty')
-                fwd_label = config.SENSOR_LABELS.get('peltier_forward', 'peltier_forward')
-            else:
-                duty_label, fwd_label = 'peltier_duty', 'peltier_forward'
-            csv_row[duty_label] = sensor_data['peltier_duty']
-            csv_row[fwd_label] = sensor_data['peltier_forward']
+        # Add peltier state to log
+        if peltier_initialized and 'peltier_duty' in sensor_data:
+            duty = sensor_data.get('peltier_duty', _NAN)
+            fwd = sensor_data.get('peltier_forward', 1.0)
+            if not isnan(duty):
+                dir_str = 'fwd' if fwd == 1.0 else 'rev'
+                log_parts.append(_PELTIER_LOG_FMT.format(duty, dir_str))
         
-        # Add ring light color if ring_light is initialized
-        if bioreactor.is_component_initialized('ring_light'):
-            for ch in ('R', 'G', 'B'):
-                key = f'ring_light_{ch}'
-                if config and hasattr(config, 'SENSOR_LABELS'):
-                    label = config.SENSOR_LABELS.get(key, key)
-                else:
-                    label = key
-                csv_row[label] = sensor_data[key]
+        # Add ring light color to log
+        if ring_light_initialized and 'ring_light_R' in sensor_data:
+            r, g, b = sensor_data.get('ring_light_R', 0), sensor_data.get('ring_light_G', 0), sensor_data.get('ring_light_B', 0)
+            if not (isnan(r) or isnan(g) or isnan(b)):
+                log_parts.append(_RING_LOG_FMT.format(int(r), int(g), int(b)))
         
-        try:
-            # Only write fields that exist in fieldnames to avoid errors
-            if hasattr(bioreactor, 'fieldnames'):
-                filtered_row = {k: v for k, v in csv_row.items() if k in bioreactor.fieldnames}
-                bioreactor.writer.writerow(filtered_row)
-            else:
-                bioreactor.writer.writerow(csv_row)
-            if hasattr(bioreactor, 'out_file'):
-                bioreactor.out_file.flush()
-        except Exception as e:
-            bioreactor.logger.error(f"Error writing to CSV: {e}")
+        log.info("Sensor readings - " + ", ".join(log_parts))
     
-    # Build log message dynamically (only include initialized sensors)
-    log_parts = []
+    return sensor_data
+
+
+def _ensure_pid_state(bioreactor) -> None:
+    """Fill in any PID state not already set (or deleted to reset it) on the bioreactor."""
+    if not hasattr(bioreactor, '_temp_integral'):
+        bioreactor._temp_integral = 0.0
+    if not hasattr(bioreactor, '_temp_last_error'):
+        bioreactor._temp_last_error = 0.0
+    if not hasattr(bioreactor, '_temp_last_time'):
+        bioreactor._temp_last_time = None
+    if not hasattr(bioreactor, '_temp_last_derivative'):
+        bioreactor._temp_last_derivative = 0.0
+
+
+def reset_temperature_pid(bioreactor) -> None:
+    """
+    Reset the temperature PID state (integral, last error/time, filtered derivative).
     
-    # Add temperature to log only if temp_sensor is initialized
-    if bioreactor.is_component_initialized('temp_sensor') and 'temperature' in sensor_data:
-        temp_value = sensor_data.get('temperature', float('nan'))
-        if not np.isnan(temp_value):
-            log_parts.append(f"Temp: {temp_value:.2f}°C")
+    The next temperature_pid_controller call starts afresh, as on its first call.
     
-    # Add OD channels to log only if optical_density is initialized
-    if bioreactor.is_component_initialized('optical_density'):
-        for ch_name in od_channel_names:
-            plot_key = f"od_{ch_name.lower()}"
-            if plot_key in sensor_data:
-                od_value = sensor_data.get(plot_key, float('nan'))
-                if not np.isnan(od_value):
-                    log_parts.append(f"OD {ch_name}: {od_value:.4f}V")
-    
-    # Add eyespy readings to log
-    if bioreactor.is_component_initialized('eyespy_adc') and hasattr(bioreactor, 'eyespy_boards'):
-        for board_name in bioreactor.eyespy_boards.keys():
-            voltage_key = f"eyespy_{board_name}_voltage"
-            if voltage_key in sensor_data:
-                voltage = sensor_data[voltage_key]
-                if not np.isnan(voltage):
-                    log_parts.append(f"Eyespy {board_name}: {voltage:.4f}V")
-    
-    # Add CO2 reading to log
-    if bioreactor.is_component_initialized('co2_sensor') and 'co2' in sensor_data:
-        co2_value = sensor_data['co2']
-        if not np.isnan(co2_value):
-            # Value is already in PPM (multiplied by 10 in read_co2)
-            log_parts.append(f"CO2: {co2_value:.0f} ppm")
-    
-    # Add O2 reading to log
-    if bioreactor.is_component_initialized('o2_sensor') and 'o2' in sensor_data:
-        o2_value = sensor_data['o2']
-        if not np.isnan(o2_value):
-            log_parts.append(f"O2: {o2_value:.2f}%")
-    
-    # Add peltier state to log
-    if bioreactor.is_component_initialized('peltier_driver') and 'peltier_duty' in sensor_data:
-        duty = sensor_data.get('peltier_duty', float('nan'))
-        fwd = sensor_data.get('peltier_forward', 1.0)
-        if not np.isnan(duty):
-            dir_str = 'fwd' if fwd == 1.0 else 'rev'
-            log_parts.append(f"Peltier: {duty:.1f}% {dir_str}")
-    
-    # Add ring light color to log
-    if bioreactor.is_component_initialized('ring_light') and 'ring_light_R' in sensor_data:
-        r, g, b = sensor_data.get('ring_light_R', 0), sensor_data.get('ring_light_G', 0), sensor_data.get('ring_light_B', 0)
-        if not (np.isnan(r) or np.isnan(g) or np.isnan(b)):
-            log_parts.append(f"Ring: ({int(r)},{int(g)},{int(b)})")
-    
-    bioreactor.logger.info(f"Sensor readings - {', '.join(log_parts)}")
+    Args:
+        bioreactor: Bioreactor instance
+    """
+    bioreactor._temp_integral = 0.0
+    bioreactor._temp_last_error = 0.0
+    bioreactor._temp_last_time = None
+    bioreactor._temp_last_derivative = 0.0
+
+
+def _pid_core(error: float, inv_dt: float, dt: float, integral: float, last_error: float, last_derivative: float,
+              kp: float, ki: float, kd: float, derivative_alpha: float, alpha_complement: float, max_duty: float):
+    """
+    Numeric part of one temperature PID step, free of I/O and bioreactor state.
     
-    return sensor_data
+    Returns:
+        tuple: (output, duty, integral, derivative)
+    """
+    # Update integral term (pure PID - no clamping)
+    integral += error * dt
+    
+    # Calculate derivative term with low-pass filtering to reduce noise sensitivity
+    raw_derivative = (error - last_error) * inv_dt
+    # Apply exponential moving average filter to derivative
+    derivative = derivative_alpha * last_derivative + alpha_complement * raw_derivative
+    
+    # Calculate PID output (pure PID formula)
+    output = kp * error + ki * integral + kd * derivative
+    
+    # Convert output to duty cycle (0-100) and clamp to max_duty (hardware safety limit)
+    # (abs() is never negative, so only the upper bound needs checking)
+    duty = abs(output)
+    if duty > max_duty:
+        duty = max_duty
+    return output, duty, integral, derivative
 
 
 def temperature_pid_controller(
@@ -610,6 +878,7 @@ def temperature_pid_controller(
     Note:
         PID state (_temp_integral, _temp_last_error, _temp_last_time) is stored on bioreactor instance.
         Initialize these values before first call if needed, or they will be auto-initialized.
+        Use reset_temperature_pid() to start the controller afresh.
         
     Example usage as a job:
         from functools import partial
@@ -624,17 +893,11 @@ def temperature_pid_controller(
         ]
         reactor.run(jobs)
     """
-    from .io import get_temperature, set_peltier_power
+    # Bind the logger to a local once per call
+    log = bioreactor.logger
     
-    # Initialize PID state if not present
-    if not hasattr(bioreactor, '_temp_integral'):
-        bioreactor._temp_integral = 0.0
-    if not hasattr(bioreactor, '_temp_last_error'):
-        bioreactor._temp_last_error = 0.0
-    if not hasattr(bioreactor, '_temp_last_time'):
-        bioreactor._temp_last_time = None
-    if not hasattr(bioreactor, '_temp_last_derivative'):
-        bioreactor._temp_last_derivative = 0.0
+    # Initialize PID state on the first call (or after it was deleted to reset it)
+    _ensure_pid_state(bioreactor)
     
     # Get current temperature if not provided
     if current_temp is None:
@@ -645,7 +908,7 @@ def temperature_pid_controller(
     
     # Calculate dt (time since last call)
     if dt is None:
-        current_time = elapsed if elapsed is not None else time.time()
+        current_time = elapsed if elapsed is not None else time.monotonic()
         if bioreactor._temp_last_time is not None:
             dt = current_time - bioreactor._temp_last_time
         else:
@@ -656,55 +919,53 @@ def temperature_pid_controller(
         if elapsed is not None:
             bioreactor._temp_last_time = elapsed
     
-    # Only update PID if error is not NaN
-    if not np.isnan(error) and not np.isnan(current_temp):
-        # Update integral term (pure PID - no clamping)
-        bioreactor._temp_integral += error * dt
-        
-        # Calculate derivative term with low-pass filtering to reduce noise sensitivity
-        raw_derivative = (error - bioreactor._temp_last_error) / dt if dt > 0 else 0.0
-        # Apply exponential moving average filter to derivative
-        derivative = derivative_alpha * bioreactor._temp_last_derivative + (1 - derivative_alpha) * raw_derivative
-        bioreactor._temp_last_derivative = derivative
-        
-        # Calculate PID output (pure PID formula)
-        output = kp * error + ki * bioreactor._temp_integral + kd * derivative
+    # Only update PID if error is not NaN (NaN != NaN; a NaN temperature
+    # always makes the error NaN too)
+    if error == error:
+        # 1/dt and (1 - alpha) only change with the arguments (dt is fixed under chemostat_mode),
+        # so keep them from the previous call when they still apply
+        pid_cache = getattr(bioreactor, '_pid_cache', None)
+        if pid_cache is None or pid_cache[0] != dt or pid_cache[2] != derivative_alpha:
+            pid_cache = bioreactor._pid_cache = (
+                dt, 1.0 / dt if dt > 0 else 0.0, derivative_alpha, 1.0 - derivative_alpha
+            )
+        _, inv_dt, _, alpha_complement = pid_cache
         
-        # Convert output to duty cycle (0-100) and clamp to max_duty (hardware safety limit)
-        duty = max(0, min(max_duty, abs(output)))
+        output, duty, bioreactor._temp_integral, bioreactor._temp_last_derivative = _pid_core(
+            error, inv_dt, dt, bioreactor._temp_integral, bioreactor._temp_last_error,
+            bioreactor._temp_last_derivative, kp, ki, kd, derivative_alpha, alpha_complement, max_duty
+        )
         
         # Determine direction based on PID output:
         # error = setpoint - current_temp
         # If error > 0 (too cold), output > 0, we need to HEAT
         # If error < 0 (too hot), output < 0, we need to COOL
-        direction = 'heat' if output > 0 else 'cool'
+        heating = output > 0
+        direction = 'heat' if heating else 'cool'
         
         # Apply peltier control
-        if bioreactor.is_component_initialized('peltier_driver'):
+        if bioreactor._caps & CAP_PELTIER:
             if duty > 0:
-                set_peltier_power(bioreactor, duty, forward=direction)
+                # Pass the driver's direction flag directly (forward cools) instead of a string
+                set_peltier_power(bioreactor, duty, forward=not heating)
             else:
                 # Turn off peltier when duty is 0
-                from .io import stop_peltier
                 stop_peltier(bioreactor)
             
-            bioreactor.logger.info(
-                f"Temperature PID: setpoint={setpoint:.2f}°C, "
-                f"current={current_temp:.2f}°C, "
-                f"error={error:.2f}°C, "
-                f"output={output:.2f}, "
-                f"duty={duty:.1f}%, "
-                f"direction={direction}, "
-                f"integral={bioreactor._temp_integral:.2f}"
+            # Lazy %-formatting: the message is only built if INFO is enabled
+            log.info(
+                "Temperature PID: setpoint=%.2f°C, current=%.2f°C, error=%.2f°C, "
+                "output=%.2f, duty=%.1f%%, direction=%s, integral=%.2f",
+                setpoint, current_temp, error, output, duty, direction, bioreactor._temp_integral
             )
         else:
-            bioreactor.logger.warning("Peltier driver not initialized; PID controller cannot modulate temperature.")
+            log.warning("Peltier driver not initialized; PID controller cannot modulate temperature.")
         
         # Store error for next iteration
         bioreactor._temp_last_error = error
     else:
         # Skip peltier update if error or temperature is NaN
-        bioreactor.logger.warning(
+        log.warning(
             f"Temperature PID: NaN detected, skipping update. "
             f"setpoint={setpoint:.2f}°C, current_temp={current_temp}"
         )
@@ -748,9 +1009,7 @@ def ring_light_cycle(
         jobs = [(ring_light_job, 1, True)]
         reactor.run(jobs)
     """
-    from .io import set_ring_light, turn_off_ring_light
-    
-    if not bioreactor.is_component_initialized('ring_light'):
+    if not bioreactor._caps & CAP_RING_LIGHT:
         bioreactor.logger.warning("Ring light not initialized; skipping cycle")
         return
     
@@ -773,8 +1032,8 @@ def ring_light_cycle(
     # Get current time
     if elapsed is None:
         if not hasattr(bioreactor, '_ring_light_start_time'):
-            bioreactor._ring_light_start_time = time.time()
-        current_time = time.time() - bioreactor._ring_light_start_time
+            bioreactor._ring_light_start_time = time.monotonic()
+        current_time = time.monotonic() - bioreactor._ring_light_start_time
     else:
         current_time = elapsed
     
@@ -825,72 +1084,41 @@ def balanced_flow(bioreactor, pump_name: str, ml_per_sec: float, elapsed: Option
         elapsed: Elapsed time (unused, for compatibility with job functions)
         duration: Optional duration in seconds to run the pumps. If provided, pumps will run
                  for this duration and then stop. Must be less than the job frequency.
-                 If None, pumps run continuously.
+                 If None, pumps run continuously. Returns immediately; the stop is carried
+                 out by a timer thread, and is dropped if the pumps are restarted first.
     """
-    from .io import change_pump
-    
-    if not bioreactor.is_component_initialized('pumps'):
+    if not bioreactor._caps & CAP_PUMPS:
         bioreactor.logger.warning("Pumps not initialized; cannot set balanced flow")
         return
     
-    if not hasattr(bioreactor, 'pumps'):
-        bioreactor.logger.warning("Pumps not available")
+    if pump_name not in bioreactor.pumps:
+        bioreactor.logger.error(f"Pump '{pump_name}' not found. Available: {list(bioreactor.pumps.keys())}")
         return
     
-    # Determine the converse pump name
-    # Default assumption: if 'inflow' exists, 'outflow' is the converse, and vice versa
-    if pump_name == 'inflow':
-        converse_name = 'outflow'
-    elif pump_name == 'outflow':
-        converse_name = 'inflow'
-    else:
-        # Try to infer from name patterns
-        if pump_name.endswith('_in') or pump_name.endswith('_inflow'):
-            # Remove suffix and add outflow suffix
-            base = pump_name.rsplit('_', 1)[0] if '_' in pump_name else pump_name
-            converse_name = f"{base}_out" if not base.endswith('out') else f"{base}_outflow"
-        elif pump_name.endswith('_out') or pump_name.endswith('_outflow'):
-            base = pump_name.rsplit('_', 1)[0] if '_' in pump_name else pump_name
-            converse_name = f"{base}_in" if not base.endswith('in') else f"{base}_inflow"
-        else:
+    # Converse pump (inflow/outflow pair), worked out once when the pumps were initialized
+    converse_name = getattr(bioreactor, '_converse_pump', {}).get(pump_name)
+    if converse_name is None or converse_name not in bioreactor.pumps:
+        if converse_name is None:
             bioreactor.logger.warning(
                 f"Cannot determine converse pump for '{pump_name}'. "
                 f"Setting only the specified pump. Available pumps: {list(bioreactor.pumps.keys())}"
             )
-            try:
-                change_pump(bioreactor, pump_name, ml_per_sec)
-                if duration is not None and duration > 0:
-                    time.sleep(duration)
-                    change_pump(bioreactor, pump_name, 0.0)
-                    bioreactor.logger.info(f"Pump {pump_name} stopped after {duration:.2f} seconds")
-            except Exception as e:
-                bioreactor.logger.error(f"Error setting pump {pump_name}: {e}")
-            return
-    
-    # Check if both pumps exist
-    if pump_name not in bioreactor.pumps:
-        bioreactor.logger.error(f"Pump '{pump_name}' not found. Available: {list(bioreactor.pumps.keys())}")
-        return
-    
-    if converse_name not in bioreactor.pumps:
-        bioreactor.logger.warning(
-            f"Converse pump '{converse_name}' not found. "
-            f"Setting only '{pump_name}'. Available pumps: {list(bioreactor.pumps.keys())}"
-        )
+        else:
+            bioreactor.logger.warning(
+                f"Converse pump '{converse_name}' not found. "
+                f"Setting only '{pump_name}'. Available pumps: {list(bioreactor.pumps.keys())}"
+            )
         try:
             change_pump(bioreactor, pump_name, ml_per_sec)
             if duration is not None and duration > 0:
-                time.sleep(duration)
-                change_pump(bioreactor, pump_name, 0.0)
-                bioreactor.logger.info(f"Pump {pump_name} stopped after {duration:.2f} seconds")
+                schedule_pump_stop(bioreactor, pump_name, duration)
         except Exception as e:
             bioreactor.logger.error(f"Error setting pump {pump_name}: {e}")
         return
     
-    # Set both pumps to the same rate
+    # Set both pumps to the same rate in one batch so they start together
     try:
-        change_pump(bioreactor, pump_name, ml_per_sec)
-        change_pump(bioreactor, converse_name, ml_per_sec)
+        change_pumps(bioreactor, {pump_name: ml_per_sec, converse_name: ml_per_sec})
         
         if duration is not None:
             if duration <= 0:
@@ -899,13 +1127,9 @@ def balanced_flow(bioreactor, pump_name: str, ml_per_sec: float, elapsed: Option
                 bioreactor.logger.info(
                     f"Balanced flow: {pump_name} and {converse_name} set to {ml_per_sec:.4f} ml/sec for {duration:.2f} seconds"
                 )
-                time.sleep(duration)
                 # Stop both pumps after duration
-                change_pump(bioreactor, pump_name, 0.0)
-                change_pump(bioreactor, converse_name, 0.0)
-                bioreactor.logger.info(
-                    f"Balanced flow: {pump_name} and {converse_name} stopped after {duration:.2f} seconds"
-                )
+                schedule_pump_stop(bioreactor, pump_name, duration)
+                schedule_pump_stop(bioreactor, converse_name, duration)
         else:
             bioreactor.logger.info(
                 f"Balanced flow: {pump_name} and {converse_name} set to {ml_per_sec:.4f} ml/sec (continuous)"